@@ -0,0 +1,55 @@
+"""
+Benchmark for BFSMazeSolver scaling.
+
+Solves looped RDFS mazes of increasing size with BFS and prints the time
+spent per cell. BFS visits every cell at most once, so the time per cell
+should stay roughly flat as the maze grows.
+
+Usage:
+    python benchmarks/bench_bfs.py [--sizes 101 501 1001 2001] [--loop 0.5]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymaze.generators import RDFSMazeGenerator
+from pymaze.solvers import BFSMazeSolver
+
+
+def bench(size: int, loop: float, seed: int) -> float:
+    random.seed(seed)
+    g = RDFSMazeGenerator(height=size, width=size)
+    g.randomized_start_finish()
+    g.loopify(chance=loop)
+    # Put the finish out of reach so BFS has to visit every passage
+    g.maze.finish_pos = None
+    start = time.perf_counter()
+    BFSMazeSolver(g.maze, flat=True)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[101, 251, 501, 1001, 2001])
+    parser.add_argument('--loop', type=float, default=0.5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f'{"size":>6} {"cells":>10} {"seconds":>9} {"us/cell":>8}')
+    per_cell = []
+    for size in args.sizes:
+        elapsed = bench(size, args.loop, args.seed)
+        cells = size * size
+        per_cell.append(elapsed / cells)
+        print(f'{size:>6} {cells:>10} {elapsed:>9.3f} {per_cell[-1]*1e6:>8.3f}')
+    print(f'Largest/smallest time per cell: {per_cell[-1]/per_cell[0]:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
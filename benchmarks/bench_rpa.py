@@ -0,0 +1,49 @@
+"""
+Benchmark for RPAMazeGenerator scaling.
+
+Generates RPA mazes of increasing size and prints the time spent per cell.
+Each iteration of RPA takes constant time, so the time per cell should stay
+roughly flat as the maze grows, all the way up to 4001x4001.
+
+Usage:
+    python benchmarks/bench_rpa.py [--sizes 251 1001 4001] [--seed 0]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymaze.generators import RPAMazeGenerator
+
+
+def bench(size: int, seed: int) -> float:
+    random.seed(seed)
+    start = time.perf_counter()
+    g = RPAMazeGenerator(height=size, width=size)
+    g.randomized_start_finish()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[251, 501, 1001, 2001, 4001])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f'{"size":>6} {"cells":>10} {"seconds":>9} {"us/cell":>8}')
+    per_cell = []
+    for size in args.sizes:
+        elapsed = bench(size, args.seed)
+        cells = size * size
+        per_cell.append(elapsed / cells)
+        print(f'{size:>6} {cells:>10} {elapsed:>9.3f} {per_cell[-1]*1e6:>8.3f}')
+    print(f'Largest/smallest time per cell: {per_cell[-1]/per_cell[0]:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
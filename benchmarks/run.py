@@ -0,0 +1,199 @@
+"""
+Benchmark suite for every maze generator and solver.
+
+Times every MazeGenMethods and MazeSolverMethods entry over a sweep of maze
+sizes, with and without loopify, using fixed seeds so every run measures
+the same mazes. The mazes in examples/ are also solved by every solver as
+fixed adversarial cases.
+
+Each case records its wall time (the best of --repeat runs), the nodes
+expanded by solvers, the peak memory allocated while it runs, measured in a
+separate run under tracemalloc, and its throughput in cells per second.
+Results are written to JSON. Pass the JSON of an earlier run as --baseline
+to flag cases that got slower by more than --threshold, or whose nodes
+expanded changed. The exit status is 1 if any case regressed.
+
+Usage:
+    python benchmarks/run.py [--sizes 51 201 1001 4001] [--loop 0.1]
+        [--output results.json] [--baseline baseline.json]
+"""
+
+import argparse
+import datetime
+import gc
+import glob
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymaze.maze import Maze
+from pymaze.generators import GENERATORS, MazeGenMethods
+from pymaze.solvers import SOLVERS
+
+EXAMPLES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'examples')
+
+
+def measure(run, repeat: int, memory: bool) -> tuple:
+    """
+    Returns the best wall time of repeat calls of run, the result of the
+    last call and the peak memory allocated by a separate call, or None
+    """
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    peak = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return best, result, peak
+
+
+def generated_maze(method: str, size: int, loop: float, seed: int) -> Maze:
+    g = GENERATORS[method](height=size, width=size, seed=seed)
+    g.randomized_start_finish()
+    if loop:
+        g.loopify(chance=loop)
+    return g.maze
+
+
+def bench_generators(args, results: list) -> None:
+    for method in GENERATORS:
+        for size in args.sizes:
+            for loop in (0.0, args.loop):
+                def run():
+                    return generated_maze(method, size, loop, args.seed)
+                seconds, _, peak = measure(run, args.repeat, args.memory)
+                results.append(record(
+                    'generate', method, f'{size}x{size}', loop, size*size, seconds, None, peak))
+                report(results[-1])
+
+
+def bench_solvers(args, results: list) -> None:
+    cases = []
+    for size in args.sizes:
+        for loop in (0.0, args.loop):
+            cases.append((f'{size}x{size}', loop,
+                          generated_maze(args.maze_method, size, loop, args.seed)))
+    for filename in sorted(glob.glob(os.path.join(EXAMPLES, '*.txt'))):
+        name = os.path.splitext(os.path.basename(filename))[0]
+        cases.append((f'example:{name}', 0.0, Maze.from_file(filename)))
+
+    for name, loop, maze in cases:
+        for method, cls in SOLVERS.items():
+            def run():
+                return cls(maze, flat=True)
+            seconds, solver, peak = measure(run, args.repeat, args.memory)
+            results.append(record(
+                'solve', method, name, loop, maze.height*maze.width,
+                seconds, solver.nodes_expanded, peak, solver.solution_cost))
+            report(results[-1])
+
+
+def record(kind: str, method: str, case: str, loop: float, cells: int, seconds: float,
+           nodes_expanded: int, peak: int, solution_cost: int = None) -> dict:
+    return {
+        'name': f'{kind}/{method}/{case}/loop={loop}',
+        'kind': kind,
+        'method': method,
+        'case': case,
+        'loop': loop,
+        'cells': cells,
+        'seconds': seconds,
+        'cells_per_second': cells / seconds if seconds else None,
+        'nodes_expanded': nodes_expanded,
+        'solution_cost': solution_cost,
+        'peak_bytes': peak,
+    }
+
+
+def report(r: dict) -> None:
+    nodes = '' if r['nodes_expanded'] is None else r['nodes_expanded']
+    peak = '' if r['peak_bytes'] is None else f'{r["peak_bytes"] / 2**20:.1f}'
+    print(f'{r["name"]:<48} {r["seconds"]:>9.4f} {nodes:>10} {peak:>9}', flush=True)
+
+
+def compare(results: list, baseline: dict, threshold: float, noise: float) -> list:
+    """
+    Returns a message for every case that got slower than its baseline by
+    more than threshold, or whose nodes expanded changed. Cases faster than
+    noise seconds in both runs are never flagged as slower
+    """
+    base = {r['name']: r for r in baseline['results']}
+    regressions = []
+    for r in results:
+        b = base.get(r['name'])
+        if b is None:
+            continue
+        if (r['seconds'] > b['seconds'] * (1 + threshold)
+                and max(r['seconds'], b['seconds']) > noise):
+            regressions.append(
+                f'{r["name"]}: {b["seconds"]:.4f}s -> {r["seconds"]:.4f}s '
+                f'({r["seconds"] / b["seconds"]:.2f}x)')
+        if r['nodes_expanded'] != b['nodes_expanded']:
+            regressions.append(
+                f'{r["name"]}: nodes expanded {b["nodes_expanded"]} -> {r["nodes_expanded"]}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[51, 201, 1001],
+                        help='odd maze sizes to sweep, up to 4001 or more')
+    parser.add_argument('--loop', type=float, default=0.1,
+                        help='loopify chance of the looped cases')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--maze-method', default=MazeGenMethods.RDFS,
+                        help='generator of the mazes the solvers are timed on')
+    parser.add_argument('--only', choices=['generate', 'solve'])
+    parser.add_argument('--no-memory', dest='memory', action='store_false',
+                        help='skip the peak memory runs')
+    parser.add_argument('--output', default='benchmark.json')
+    parser.add_argument('--baseline', help='JSON of an earlier run to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='slowdown over the baseline that counts as a regression')
+    parser.add_argument('--noise', type=float, default=0.005,
+                        help='cases faster than this many seconds are never flagged')
+    args = parser.parse_args()
+
+    print(f'{"case":<48} {"seconds":>9} {"nodes":>10} {"peak MiB":>9}')
+    results = []
+    if args.only != 'solve':
+        bench_generators(args, results)
+    if args.only != 'generate':
+        bench_solvers(args, results)
+
+    with open(args.output, 'w') as f:
+        json.dump({
+            'created': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'args': vars(args),
+            'results': results,
+        }, f, indent=1)
+    print(f'Wrote {len(results)} results to {args.output}')
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold, args.noise)
+        for msg in regressions:
+            print(f'REGRESSION {msg}')
+        print(f'{len(regressions)} regressions against {args.baseline}')
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
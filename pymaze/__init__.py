@@ -1,3 +1,11 @@
 from .maze import CellType, Cell, Maze
+from .graph import JunctionGraph
+from .tree import TreeDistanceOracle
 from .generators import *
-from .solvers import *
\ No newline at end of file
+from .solvers import *
+from .batch import BatchSolver, BatchResult
+from .cache import SolutionCache, CachedSolution
+from .parallel import (
+    GenerationJob, make_jobs, generate_batch, write_batch, generate_tiled,
+    PortfolioResult, solve_portfolio)
+from .shared import SharedMaze, SharedMazeHandle
@@ -0,0 +1,167 @@
+"""
+This file contains the batch solve API, which answers many (start, finish)
+queries over a single maze without moving the maze's own endpoints.
+
+BFS and UCS queries are answered by sharing search trees: all queries with
+the same start are served by one BFS from that start, which stops as soon
+as every finish asked for has been reached. The BFS buffers are allocated
+once per BatchSolver and reused across searches by stamping every cell with
+the number of the search that last touched it, so nothing is cleared
+between searches.
+
+Every other method runs its solver once per query. The solvers take their
+search state from one :class:`SearchBuffers` per BatchSolver, which is
+emptied by stamping in the same way, so a query costs only the cells its
+search touches.
+"""
+
+from array import array
+from collections import deque
+from typing import Iterable, List, Tuple
+
+from pymaze.maze import Maze, Cell
+from pymaze.solvers import MazeSolverMethods, SOLVERS
+from pymaze.utils import SearchBuffers, index_typecode
+
+
+class BatchResult:
+    """
+    Compact results of a batch solve
+
+    costs[i] is the length of the path found for query i, or -1 if there is
+    no path. The path itself is stored as flat cell ids in
+    cells[offsets[i]:offsets[i]+costs[i]], excluding the start and including
+    the finish like a solver's solution.
+    """
+
+    def __init__(self, maze: Maze, size: int) -> None:
+        self.maze = maze
+        typecode = index_typecode(maze.height * maze.width)
+        self.costs = array(typecode, [-1]) * size
+        self.offsets = array('q', [0]) * size
+        self.cells = array(typecode)
+        self.nodes_expanded = 0
+
+    def add_path(self, i: int, path: Iterable[int]) -> None:
+        """
+        Stores the path of flat cell ids found for query i
+        """
+        self.offsets[i] = len(self.cells)
+        self.cells.extend(path)
+        self.costs[i] = len(self.cells) - self.offsets[i]
+
+    def cost(self, i: int) -> int:
+        """
+        Returns the cost of query i, or -1 if there is no path
+        """
+        return self.costs[i]
+
+    def path(self, i: int) -> List[Cell]:
+        """
+        Returns the path found for query i as :class:`Cell` objects
+        """
+        a = self.offsets[i]
+        return [self.maze.id_to_cell(c)
+                for c in self.cells[a:a+max(self.costs[i], 0)]]
+
+    def __len__(self) -> int:
+        return len(self.costs)
+
+
+class BatchSolver:
+    """
+    Solves many (start, finish) queries over one maze
+    """
+
+    def __init__(self, maze: Maze, method: str = MazeSolverMethods.BFS, **kwargs) -> None:
+        """
+        Parameters
+        ----------
+        maze: Maze
+            The maze to solve. It must not change while the solver is used
+        method: str, default=MazeSolverMethods.BFS
+            The solver used to answer queries
+
+        Keyword arguments are sent to the solver, e.g. heuristic for A*
+        """
+        if method not in SOLVERS:
+            raise ValueError(f'Invalid method: {method}')
+        self.maze = maze
+        self.method = method
+        self.kwargs = kwargs
+        graph = kwargs.get('graph')
+        self.shared = (method in (MazeSolverMethods.BFS, MazeSolverMethods.UCS)
+                       and graph is None)
+
+        size = maze.height * maze.width
+        if self.shared:
+            self.parent = array(index_typecode(size), [-1]) * size
+            self.stamp = array('q', [0]) * size
+        else:
+            self.buffers = SearchBuffers(size if graph is None else graph.size)
+        self.searches = 0
+
+    def solve(self, pairs: Iterable[Tuple[Cell, Cell]]) -> BatchResult:
+        """
+        Solves every (start, finish) pair and returns a :class:`BatchResult`
+        with the results in the same order as pairs
+        """
+        pairs = list(pairs)
+        for start, finish in pairs:
+            if not self.maze.is_valid_cell(start) or not self.maze.is_valid_cell(finish):
+                raise ValueError(f'Invalid query: {start} to {finish}')
+        result = BatchResult(self.maze, len(pairs))
+        if not self.shared:
+            cls = SOLVERS[self.method]
+            for i, (start, finish) in enumerate(pairs):
+                self.buffers.reset()
+                self.searches += 1
+                s = cls(self.maze, start=start, finish=finish, buffers=self.buffers,
+                        **self.kwargs)
+                result.nodes_expanded += s.nodes_expanded
+                if s.solution or start == finish:
+                    result.add_path(i, (self.maze.cell_id(c) for c in s.solution))
+            return result
+
+        by_start = {}
+        for i, (start, finish) in enumerate(pairs):
+            targets = by_start.setdefault(self.maze.cell_id(start), {})
+            targets.setdefault(self.maze.cell_id(finish), []).append(i)
+        for s, targets in by_start.items():
+            self._search(s, targets, result)
+        return result
+
+    def _search(self, s: int, targets: dict, result: BatchResult) -> None:
+        """
+        Runs a BFS from s until every cell in targets is reached, then
+        stores the paths of the queries waiting on each target
+        """
+        offsets, neighbors = self.maze.build_adjacency()
+        parent, stamp = self.parent, self.stamp
+        self.searches += 1
+        search = self.searches
+        stamp[s] = search
+        parent[s] = -1
+        remaining = len(targets) - (s in targets)
+        queue = deque([s])
+        while queue and remaining:
+            p = queue.popleft()
+            for n in neighbors[offsets[p]:offsets[p+1]]:
+                if stamp[n] != search:
+                    stamp[n] = search
+                    parent[n] = p
+                    queue.append(n)
+                    result.nodes_expanded += 1
+                    if n in targets:
+                        remaining -= 1
+        for f, queries in targets.items():
+            if stamp[f] != search:
+                continue
+            path = []
+            p = f
+            while p != s:
+                path.append(p)
+                p = parent[p]
+            path.reverse()
+            for i in queries:
+                result.add_path(i, path)
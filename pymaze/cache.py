@@ -0,0 +1,102 @@
+"""
+This file contains an opt-in LRU cache of solver results.
+
+Results are keyed by the maze's content hash and dimensions, the endpoints,
+the solver method and the heuristic. The content hash is kept up to date by
+Maze.set, so building the key is cheap even after the maze changes and no
+lookup reads the grid.
+
+The content hash has 122 bits, from two independent 61-bit hashes, so the
+chance that two different grids share a key is negligible.
+"""
+
+from collections import OrderedDict, namedtuple
+
+from pymaze.maze import Maze, Cell
+from pymaze.solvers import SOLVERS
+
+CachedSolution = namedtuple(
+    'CachedSolution', ['solution', 'solution_cost', 'nodes_expanded'])
+
+
+class SolutionCache:
+    """
+    Bounded cache of solver results with least recently used eviction
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        """
+        Parameters
+        ----------
+        maxsize: int, default=128
+            The most results kept. The least recently used result is evicted
+            when the cache is full
+        """
+        if maxsize <= 0:
+            raise ValueError('Cache size must be a positive integer')
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._results = OrderedDict()
+
+    def solve(self, maze: Maze, method: str, start: Cell = None,
+              finish: Cell = None, heuristic: str = None, **kwargs) -> CachedSolution:
+        """
+        Returns the result of solving maze with method, solving it only if
+        the same query is not cached
+
+        Parameters
+        ----------
+        maze: Maze
+            The maze to solve
+        method: str
+            A :class:`MazeSolverMethods` value
+        start: Cell, optional
+            The cell to start from. Defaults to the maze's start
+        finish: Cell, optional
+            The cell to find. Defaults to the maze's finish
+        heuristic: str, optional
+            The heuristic to use for solvers that take one
+
+        Other keyword arguments, such as flat, are sent to the solver. They
+        must not change the solution since they are not part of the key.
+
+        Returns
+        -------
+        CachedSolution
+            The solution as a tuple of cells, its cost and the number of
+            nodes the solver expanded
+        """
+        if method not in SOLVERS:
+            raise ValueError(f'Invalid method: {method}')
+        start = maze.start_pos if start is None else start
+        finish = maze.finish_pos if finish is None else finish
+        key = (maze.content_hash, maze.height, maze.width,
+               start, finish, method, heuristic)
+        res = self._results.get(key)
+        if res is not None:
+            self.hits += 1
+            self._results.move_to_end(key)
+            return res
+
+        self.misses += 1
+        if heuristic is not None:
+            kwargs['heuristic'] = heuristic
+        s = SOLVERS[method](maze, start=start, finish=finish, **kwargs)
+        res = CachedSolution(tuple(s.solution), s.solution_cost, s.nodes_expanded)
+        self._results[key] = res
+        self._results.move_to_end(key)
+        if len(self._results) > self.maxsize:
+            self._results.popitem(last=False)
+        return res
+
+    def clear(self) -> None:
+        """
+        Removes every result and resets the hit and miss counters
+        """
+        self._results.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._results)
@@ -9,6 +9,22 @@ all in one go. The algorithms implemented are:
     - Implemented in the RDFSMazeGenerator class
 - Randomized Prim's Algorithm
     - Implemented in the RPAMazeGenerator class
+- Randomized Kruskal's Algorithm
+    - Implemented in the KruskalMazeGenerator class
+- Eller's Algorithm
+    - Implemented in the EllerMazeGenerator class
+- Binary Tree Algorithm
+    - Implemented in the BinaryTreeMazeGenerator class
+- Sidewinder Algorithm
+    - Implemented in the SidewinderMazeGenerator class
+- Aldous-Broder Algorithm
+    - Implemented in the AldousBroderMazeGenerator class
+- Wilson's Algorithm
+    - Implemented in the WilsonMazeGenerator class
+
+Eller, Binary Tree and Sidewinder build the maze one row at a time (see the
+RowMazeGenerator class) and can stream it row by row to a file without
+keeping it in memory.
 
 A maze can be generated by creating an object of one of these classes.
 Arguments for the generator can be passed to the constructor. See the
@@ -24,13 +40,37 @@ Generators can be ran in 2 modes:
     finishes.
 """
 
+import operator
 import random
+import re
+from typing import List
 
+from pymaze import mazefile
 from pymaze.maze import Maze, Cell, CellType
+from pymaze.utils import DisjointSet, bernoulli_indices
+
+# Translate cell values to 1 for passages or walls and 0 otherwise
+_PASSAGE_MASK = bytes.maketrans(bytes(range(4)), bytes([0, 1, 1, 1]))
+_WALL_MASK = bytes.maketrans(bytes(range(4)), bytes([1, 0, 0, 0]))
+
+# Translate random bits to the cell values of the walls they open
+_NORTH = bytes.maketrans(b'01', bytes([CellType.WALL.value, CellType.PASSAGE.value]))
+_WEST = bytes.maketrans(b'01', bytes([CellType.PASSAGE.value, CellType.WALL.value]))
+_EAST = _NORTH
+
+# A run of cells joined east and the cell that ends it
+_RUNS = re.compile(b'1*0')
+_RUN_END = operator.methodcaller('end')
 
 class MazeGenMethods:
     RDFS = 'RDFS'
     RPA = "RPA"
+    KRUSKAL = 'KRUSKAL'
+    ELLER = 'ELLER'
+    BINARY_TREE = 'BINARY_TREE'
+    SIDEWINDER = 'SIDEWINDER'
+    ALDOUS_BRODER = 'ALDOUS_BRODER'
+    WILSON = 'WILSON'
 
 class MazeGenerator:
     """
@@ -53,9 +93,19 @@ class MazeGenerator:
             The height of the maze. The height must be an odd integer larger than 3
         width: int, default=105
             The width of the maze. The width must be an odd integer larger than 3
+        seed: int, optional
+            Seed of a random.Random instance used only by this generator, so
+            the same seed always generates the same maze
+        rng: random.Random, optional
+            The random number generator to use. Defaults to a new one seeded
+            with seed, or the global random module if no seed is given
         """
         self.maze: Maze = None
         self.step_mode = kwargs.pop('step', False)
+        self.seed = kwargs.pop('seed', None)
+        self.rng = kwargs.pop('rng', None)
+        if self.rng is None:
+            self.rng = random if self.seed is None else random.Random(self.seed)
         self.height = kwargs.pop('height', 105)
         if self.height % 2 == 0 or self.height <= 3 or not isinstance(self.height, int):
             raise ValueError('Maze height must be an odd integer larger than 3')
@@ -68,17 +118,26 @@ class MazeGenerator:
     def randomized_start_finish(self):
         """
         Randomly choose a start and finish cell and set them in the maze
+
+        Both are drawn directly from the cells with odd rows and columns,
+        which are all passages once a maze is generated. If the drawn cell
+        is a wall anyway, the draw is repeated over the passages only.
         """
+        kw = self.maze.width // 2
+        n = (self.maze.height // 2) * kw
+        i = self.rng.randrange(n)
+        j = self.rng.randrange(n - 1)
+        if j >= i:
+            j += 1
+        s = Cell(2*(i // kw) + 1, 2*(i % kw) + 1)
+        f = Cell(2*(j // kw) + 1, 2*(j % kw) + 1)
+        if self.maze.is_wall(s) or self.maze.is_wall(f):
+            passages = [c for c in (Cell(2*(k // kw) + 1, 2*(k % kw) + 1) for k in range(n))
+                        if self.maze.is_passage(c)]
+            s, f = self.rng.sample(passages, 2)
 
-        s = self.random_cell(self.maze.height, self.maze.width, is_odd=True)
-        while self.maze.is_wall(s):
-            s = self.random_cell(self.maze.height, self.maze.width, is_odd=True)
         self.maze.start_pos = s
         self.maze.set(s, CellType.START)
-
-        f = self.random_cell(self.maze.height, self.maze.width, is_odd=True)
-        while self.maze.is_wall(f) or f == self.maze.start_pos:
-            f = self.random_cell(self.maze.height, self.maze.width, is_odd=True)
         self.maze.finish_pos = f
         self.maze.set(f, CellType.FINISH)
     
@@ -100,13 +159,24 @@ class MazeGenerator:
         Cell
             The randomly chosen cell as a Cell object
         """
-        row = random.randint(0, max_row-1)
-        while is_odd and row % 2 == 0:
-            row = random.randint(0, max_row-1)
-        col = random.randint(0, max_col-1)
-        while is_odd and col % 2 == 0:
-            col = random.randint(0, max_col-1)
-        return Cell(row, col)
+        if is_odd:
+            return Cell(2*self.rng.randrange(max_row // 2) + 1,
+                        2*self.rng.randrange(max_col // 2) + 1)
+        return Cell(self.rng.randrange(max_row), self.rng.randrange(max_col))
+
+    def cell_mask(self) -> bytearray:
+        """
+        Utility function that returns a flat mask of the maze grid, set to 1
+        for the cells with odd row and col values. A cell's neighboring
+        cells at distance 2 are its flat id plus -2*width, 2*width, -2 and 2,
+        and any of these that fall off the grid are ruled out by checking
+        the bounds and the mask
+        """
+        w = self.width
+        mask = bytearray(self.height * w)
+        for row in range(1, self.height, 2):
+            mask[row*w+1:(row+1)*w-1:2] = b'\x01' * ((w-1)//2)
+        return mask
 
     def middle_cell(self, c1: Cell, c2: Cell) -> Cell:
         """
@@ -128,28 +198,57 @@ class MazeGenerator:
         col = dc + min(cell.col, n.col) if dc < 0 else dc + max(cell.col, n.col)
         return Cell(row, col)
     
-    def loopify(self, chance=0.1) -> None:
+    def loopify(self, chance=0.1) -> List[Cell]:
         """
         Adds loops to the maze by deleting walls seperating two passages.
 
+        The candidate walls are found a row at a time with masks over the
+        whole row. Each row is read as a big integer with one byte per cell,
+        so the neighbor checks are integer shifts and ANDs. The chance is
+        then applied to all candidates with one draw per deleted wall.
+
         Parameters
         ----------
         chance: float, default=0.1
             The chance that a wall is deleted
+
+        Returns
+        -------
+        List[Cell]
+            The cells that were changed to passages
         """
         if not 0 <= chance <= 1:
             raise ValueError('Loop chance must be a number between 0 and 1!')
-        changed = []
-        for i in range(2, self.maze.height-2, 2):
-            for j in range(2, self.maze.width-2, 2):
-                c = Cell(i, j)
-                if self.maze.is_wall(c) and random.random() < chance:
-                    for n in self.maze.get_neighboring_passages(c):
-                        o = self.opposite_cell(c, n)
-                        if self.maze.is_passage(o):
-                            self.maze.set(c, CellType.PASSAGE)
-                            changed.append(c)
-                            break
+        h, w = self.maze.height, self.maze.width
+        grid = self.maze.grid
+
+        def mask(row: int, table: bytes) -> int:
+            return int.from_bytes(grid[row*w:(row+1)*w].translate(table), 'big')
+
+        # Only walls at even rows and columns away from the border are deleted
+        cols = bytearray(w)
+        cols[2:w-2:2] = b'\x01' * len(range(2, w-2, 2))
+        cols = int.from_bytes(cols, 'big')
+
+        candidates = []
+        above = mask(1, _PASSAGE_MASK) if h > 1 else 0
+        for i in range(2, h-2, 2):
+            row = mask(i, _PASSAGE_MASK)
+            below = mask(i+1, _PASSAGE_MASK)
+            # A wall can be deleted if both cells above and below it, or
+            # both cells left and right of it, are passages
+            found = (mask(i, _WALL_MASK) & cols
+                     & ((above & below) | ((row << 8) & (row >> 8))))
+            if found:
+                found = found.to_bytes(w, 'big')
+                j = found.find(1)
+                while j != -1:
+                    candidates.append(Cell(i, j))
+                    j = found.find(1, j+1)
+            above = below
+        changed = [candidates[k] for k in bernoulli_indices(len(candidates), chance, self.rng)]
+        for c in changed:
+            self.maze.set(c, CellType.PASSAGE)
         return changed
 
 class RDFSMazeGenerator(MazeGenerator):
@@ -165,14 +264,13 @@ class RDFSMazeGenerator(MazeGenerator):
         super().__init__(**kwargs)
 
         # Initialize maze as a grid of walls
-        m = [[CellType.WALL for _ in range(
-            self.width)] for _ in range(self.height)]
-
-        self.maze = Maze(m)
+        self.maze = Maze.filled(
+            CellType.WALL, height=self.height, width=self.width)
         self.frontier = []
 
         # Randomly choose starting point
         start = self.random_cell(self.height, self.width, is_odd=True)
+        self.maze.set(start, CellType.PASSAGE)
         self.frontier.append(start)
 
         if self.step_mode:
@@ -193,7 +291,7 @@ class RDFSMazeGenerator(MazeGenerator):
         cell = self.frontier[-1]
         neighbors = self.maze.get_neighboring_walls(cell, d=2)
         if neighbors:
-            n = random.choice(neighbors)
+            n = self.rng.choice(neighbors)
             #self.maze.set(cell, CellType.PASSAGE)
             self.maze.set(n, CellType.PASSAGE)
             middle = self.middle_cell(cell, n)
@@ -207,6 +305,11 @@ class RDFSMazeGenerator(MazeGenerator):
 class RPAMazeGenerator(MazeGenerator):
     """
     Maze Generator using Randomized Prim's Algorithm
+
+    The frontier holds flat ids of the cells next to the maze. A random
+    frontier cell is removed by swapping it with the last one and popping,
+    so each iteration takes constant time and generation is linear in the
+    size of the maze.
     """
     def __init__(self, **kwargs) -> None:
         """
@@ -216,50 +319,582 @@ class RPAMazeGenerator(MazeGenerator):
         super().__init__(**kwargs)
         
         # Initialize maze as a grid of walls
-        m = [[CellType.WALL for _ in range(
-            self.width)] for _ in range(self.height)]
-        
-        self.maze = Maze(m)
+        self.maze = Maze.filled(
+            CellType.WALL, height=self.height, width=self.width)
+        w = self.width
+        self.offsets = (-2*w, 2*w, -2, 2)
+        self.cells = self.cell_mask()
+        # Marks cells that are or have been in the frontier
+        self.frontier_set = bytearray(len(self.cells))
         self.frontier = []
-        self.frontier_set = set()
 
-        start = self.random_cell(self.height, self.width, is_odd=True)
-        self.maze.set(start, CellType.PASSAGE)
-        for n in self.maze.get_neighboring_walls(start, d=2):
-            self.frontier.append(n)
-            self.frontier_set.add(n)
+        start = self.maze.cell_id(self.random_cell(self.height, self.width, is_odd=True))
+        self.maze.grid[start] = CellType.PASSAGE.value
+        self.frontier_set[start] = 1
+        self.add(start)
 
         if self.step_mode:
             return
-        while not self.finished:
-            self.step()
-    
+        self.carve()
+        self.maze.invalidate()
+        self.finished = True
+
+    def add(self, p: int) -> None:
+        """
+        Adds the cells next to p that were never in the frontier to it
+        """
+        cells, seen = self.cells, self.frontier_set
+        size = len(cells)
+        for d in self.offsets:
+            q = p + d
+            if 0 <= q < size and cells[q] and not seen[q]:
+                seen[q] = 1
+                self.frontier.append(q)
+
+    def carve(self, count: int = -1, changed: List[int] = None) -> None:
+        """
+        Adds count frontier cells to the maze, or all of them if count is
+        negative, appending the flat ids of every wall and cell opened to
+        changed if given
+        """
+        grid, cells, offsets = self.maze.grid, self.cells, self.offsets
+        frontier, add = self.frontier, self.add
+        size = len(grid)
+        passage = CellType.PASSAGE.value
+        randrange, choice = self.rng.randrange, self.rng.choice
+        while count and frontier:
+            i = randrange(len(frontier))
+            p = frontier[i]
+            frontier[i] = frontier[-1]
+            frontier.pop()
+            # Every frontier cell has a passage next to it, the one that
+            # added it
+            q = choice([p + d for d in offsets
+                        if 0 <= p + d < size and cells[p + d] and grid[p + d] == passage])
+            m = (p + q) >> 1
+            grid[p] = grid[m] = passage
+            if changed is not None:
+                changed += (p, m, q)
+            add(p)
+            count -= 1
+
     def step(self):
         """
         Each call to this function will execute a single iteration of the algorithm.
         It is recommended to continually call this function in a loop while the finished
         attribute is False.
         """
-        def add(c1, c2, c3):
-            self.maze.set(c1, CellType.PASSAGE)
-            self.maze.set(c2, CellType.PASSAGE)
-            self.maze.set(c3, CellType.PASSAGE)
+        if not self.frontier:
+            self.finished = True
+            return None
+        changed = []
+        self.carve(1, changed)
+        self.maze.invalidate()
+        return tuple(self.maze.id_to_cell(i) for i in changed)
 
-            for tmp in self.maze.get_neighboring_walls(c1, d=2):
-                if not tmp in self.frontier_set:
-                    self.frontier.append(tmp)
-                    self.frontier_set.add(tmp)
 
-        if not self.frontier:
+class KruskalMazeGenerator(MazeGenerator):
+    """
+    Maze Generator using Randomized Kruskal's Algorithm
+
+    Every wall between two cells is an edge. The edges are shuffled once
+    and a wall is deleted whenever the cells on either side of it are not
+    yet connected, which is tracked with a :class:`DisjointSet`.
+    """
+    def __init__(self, **kwargs) -> None:
+        """
+        Initializes the Kruskal generator. All keyword arguments are
+        sent to the :class:`MazeGenerator` constructor.
+        """
+        super().__init__(**kwargs)
+
+        # Initialize maze as a grid of walls
+        self.maze = Maze.filled(
+            CellType.WALL, height=self.height, width=self.width)
+
+        # Walls between cells, as flat grid ids. Cells have odd rows and
+        # columns, so walls between them have one odd and one even coordinate
+        w = self.width
+        self.frontier = [r*w + c for r in range(1, self.height-1)
+                         for c in range(1 + r % 2, w-1, 2)]
+        self.rng.shuffle(self.frontier)
+        self.sets = DisjointSet(((self.height-1)//2) * ((w-1)//2))
+        self.remaining = len(self.sets.parent) - 1
+
+        if self.step_mode:
+            return
+        self.generate()
+
+    def cells(self, wall: int) -> tuple:
+        """
+        Returns the flat ids of the two cells on either side of wall
+        """
+        row, _ = divmod(wall, self.width)
+        if row % 2:
+            return wall - 1, wall + 1
+        return wall - self.width, wall + self.width
+
+    def set_id(self, i: int) -> int:
+        """
+        Returns the disjoint set element of the cell with flat id i
+        """
+        row, col = divmod(i, self.width)
+        return (row // 2) * ((self.width-1) // 2) + col // 2
+
+    def generate(self) -> None:
+        """
+        Runs the whole algorithm without stepping. Every cell is opened up
+        front in bulk and only walls are deleted while going through the
+        edges
+        """
+        grid = self.maze.grid
+        w = self.width
+        passage = CellType.PASSAGE.value
+        for row in range(1, self.height, 2):
+            grid[row*w+1:(row+1)*w-1:2] = bytes([passage]) * ((w-1)//2)
+        union, set_id = self.sets.union, self.set_id
+        for wall in reversed(self.frontier):
+            if not self.remaining:
+                break
+            a, b = self.cells(wall)
+            if union(set_id(a), set_id(b)):
+                grid[wall] = passage
+                self.remaining -= 1
+        self.frontier.clear()
+        self.maze.invalidate()
+        self.finished = True
+
+    def step(self):
+        """
+        Each call to this function will execute a single iteration of the algorithm.
+        It is recommended to continually call this function in a loop while the finished
+        attribute is False.
+        """
+        if not self.frontier or not self.remaining:
             self.finished = True
             return None
-        wall = self.frontier.pop(random.randint(0, len(self.frontier)-1))
-        self.frontier_set.remove(wall)
-        neighbors = self.maze.get_neighboring_cells(wall, d=2)
-        random.shuffle(neighbors)
-        for n in neighbors:
-            if self.maze.is_passage(n):
-                middle = self.middle_cell(wall, n)
-                add(wall, middle, n)
-                return (wall, middle, n)
-        return None
+        wall = self.frontier.pop()
+        a, b = self.cells(wall)
+        if not self.sets.union(self.set_id(a), self.set_id(b)):
+            return None
+        self.remaining -= 1
+        res = (self.maze.id_to_cell(a), self.maze.id_to_cell(wall), self.maze.id_to_cell(b))
+        for c in res:
+            self.maze.set(c, CellType.PASSAGE)
+        return res
+
+
+class RowMazeGenerator(MazeGenerator):
+    """
+    Base class for generators that produce the maze one row at a time
+
+    Subclasses implement :method:`rows`. The maze can then be built in
+    memory like with any other generator, stepped through a row of cells at
+    a time, or streamed straight to a file with :method:`write` without
+    ever holding the whole maze.
+    """
+    method = None
+
+    def __init__(self, **kwargs) -> None:
+        """
+        Other keyword arguments are sent to the :class:`MazeGenerator`
+        constructor.
+
+        Parameters
+        ----------
+        stream: bool, default=False
+            If True, no :class:`Maze` is built. Use :method:`rows` or
+            :method:`write` to get the maze instead
+        """
+        stream = kwargs.pop('stream', False)
+        super().__init__(**kwargs)
+        if stream:
+            return
+
+        if self.step_mode:
+            self.maze = Maze.filled(
+                CellType.WALL, height=self.height, width=self.width)
+            self.frontier = self.rows()
+            next(self.frontier)
+            self.row = 1
+            return
+        self.maze = Maze.from_buffer(
+            bytearray().join(self.rows()), self.height, self.width)
+        self.finished = True
+
+    def rows(self):
+        """
+        Yields the rows of a new maze from top to bottom as bytes of
+        CellType values, the same layout as a row of :attr:`Maze.grid`
+        """
+        raise NotImplementedError
+
+    def write(self, filename: str, binary: bool = False, **kwargs) -> None:
+        """
+        Generates a maze straight into a file, one row at a time. The start
+        is a random cell of the first row and the finish a random cell of
+        the last row. The cells are the same as those of the maze built in
+        memory with the same seed
+
+        Parameters
+        ----------
+        filename: str
+            The name of the file to write to
+        binary: bool, default=False
+            If True, write the binary format of :mod:`pymaze.mazefile`
+            instead of text
+
+        Other keyword arguments are the characters used in the text format,
+        such as wall_char, which are sent to the :class:`Maze` constructor.
+        In the binary format they are stored in the metadata of the file
+        """
+        template = Maze(None, **kwargs)
+        # The endpoints are needed before the rows, so they are drawn from a
+        # copy of rng reseeded from its next draw. rng itself is untouched
+        # and generates the same rows as in memory
+        ends = random.Random()
+        ends.setstate(self.rng.getstate())
+        ends.seed(ends.getrandbits(64))
+        kw = (self.width - 1) // 2
+        start = Cell(1, 2*ends.randrange(kw) + 1)
+        finish = Cell(self.height-2, 2*ends.randrange(kw) + 1)
+        marks = {start.row: (start.col, CellType.START.value),
+                 finish.row: (finish.col, CellType.FINISH.value)}
+
+        if binary:
+            with open(filename, 'wb') as f:
+                mazefile.write_header(
+                    f, self.height, self.width, start, finish,
+                    chars=[template.wall_char, template.passage_char,
+                           template.start_char, template.finish_char],
+                    generator=self.method, seed=self.seed)
+                for row in self.rows():
+                    f.write(mazefile.pack_row(row))
+            return
+
+        table = template._chars()
+        with open(filename, 'w') as f:
+            for r, row in enumerate(self.rows()):
+                if r in marks:
+                    row = bytearray(row)
+                    col, val = marks[r]
+                    row[col] = val
+                f.write(str(row, 'latin-1').translate(table))
+                f.write('\n')
+
+    def step(self):
+        """
+        Each call to this function will generate the next row of cells and
+        the row below it.
+        It is recommended to continually call this function in a loop while the finished
+        attribute is False.
+        """
+        if self.finished:
+            return None
+        res = []
+        for r in (self.row, self.row + 1):
+            row = next(self.frontier)
+            for c, val in enumerate(row):
+                if val == CellType.PASSAGE.value:
+                    cell = Cell(r, c)
+                    self.maze.set(cell, CellType.PASSAGE)
+                    res.append(cell)
+        self.row += 2
+        if self.row >= self.height - 1:
+            self.finished = True
+        return res
+
+
+class EllerMazeGenerator(RowMazeGenerator):
+    """
+    Maze Generator using Eller's Algorithm
+
+    Eller's algorithm builds the maze one row of cells at a time and only
+    remembers which set each cell of the current row belongs to. Memory use
+    is O(width) no matter the height, so :method:`rows` and :method:`write`
+    can produce mazes far larger than fit in memory.
+    """
+    method = MazeGenMethods.ELLER
+
+    def rows(self):
+        w = self.width
+        kw = (w - 1) // 2
+        cell_rows = (self.height - 1) // 2
+        wall, passage = CellType.WALL.value, CellType.PASSAGE.value
+        border = bytes([wall]) * w
+        cells = bytearray(border)
+        cells[1:w-1:2] = bytes([passage]) * kw
+
+        # sets[c] is the set of cell c in the current row, members[s] the
+        # cells in set s. There are never more sets than cells in a row
+        sets = list(range(kw))
+        members = [[c] for c in range(kw)]
+        rand = self.rng.random
+
+        yield border
+        for i in range(cell_rows):
+            last = i == cell_rows - 1
+            row = bytearray(cells)
+            for c in range(kw - 1):
+                a, b = sets[c], sets[c+1]
+                if a != b and (last or rand() < 0.5):
+                    row[2*c+2] = passage
+                    # Relabel the smaller set
+                    if len(members[a]) < len(members[b]):
+                        a, b = b, a
+                    for m in members[b]:
+                        sets[m] = a
+                    members[a] += members[b]
+                    members[b] = []
+            yield bytes(row)
+            if last:
+                break
+
+            # Every set continues down through at least one of its cells.
+            # The other cells start new sets in the next row
+            below = bytearray(border)
+            down = [[] for _ in range(kw)]
+            for s, cols in enumerate(members):
+                if cols:
+                    keep = [c for c in cols if rand() < 0.5] or [self.rng.choice(cols)]
+                    for c in keep:
+                        below[2*c+1] = passage
+                    down[s] = keep
+            free = [s for s in range(kw) if not down[s]]
+            for c in range(kw):
+                if below[2*c+1] == wall:
+                    s = free.pop()
+                    sets[c] = s
+                    down[s].append(c)
+            members = down
+            yield bytes(below)
+        yield border
+
+
+class BinaryTreeMazeGenerator(RowMazeGenerator):
+    """
+    Maze Generator using the Binary Tree Algorithm
+
+    Every cell opens the wall to its north or to its west, chosen by one
+    random bit. The bits of a whole row are drawn at once and the row is
+    built with slice assignments, so no Python code runs per cell. The
+    mazes have long corridors along the top row and the left column.
+    """
+    method = MazeGenMethods.BINARY_TREE
+
+    def rows(self):
+        w = self.width
+        kw = (w - 1) // 2
+        wall, passage = CellType.WALL.value, CellType.PASSAGE.value
+        border = bytes([wall]) * w
+        cells = bytearray(border)
+        cells[1:w-1:2] = bytes([passage]) * kw
+
+        # The top row can only go west
+        yield border
+        row = bytearray(cells)
+        row[2:w-1:2] = bytes([passage]) * (kw - 1)
+        yield bytes(row)
+        for _ in range((self.height - 3) // 2):
+            # A 1 bit opens north, a 0 bit opens west. The first cell of
+            # the row can only go north
+            bits = format(self.rng.getrandbits(kw) | (1 << kw-1), f'0{kw}b').encode()
+            above = bytearray(border)
+            above[1:w-1:2] = bits.translate(_NORTH)
+            yield bytes(above)
+            row = bytearray(cells)
+            row[2:w-1:2] = bits[1:].translate(_WEST)
+            yield bytes(row)
+        yield border
+
+
+class SidewinderMazeGenerator(RowMazeGenerator):
+    """
+    Maze Generator using the Sidewinder Algorithm
+
+    Each row is split into runs of cells joined east to west by one random
+    bit per cell, and every run opens north through one random cell of the
+    run. The bits of a whole row are drawn at once and the east walls are
+    opened with a slice assignment, so only the runs are handled in Python.
+    The top row is a single corridor.
+    """
+    method = MazeGenMethods.SIDEWINDER
+
+    def rows(self):
+        w = self.width
+        kw = (w - 1) // 2
+        wall, passage = CellType.WALL.value, CellType.PASSAGE.value
+        border = bytes([wall]) * w
+        cells = bytearray(border)
+        cells[1:w-1:2] = bytes([passage]) * kw
+
+        rand = self.rng.random
+
+        yield border
+        row = bytearray(cells)
+        row[2:w-1:2] = bytes([passage]) * (kw - 1)
+        yield bytes(row)
+        for _ in range((self.height - 3) // 2):
+            # A 1 bit continues the run east. The last cell always ends it
+            bits = format(self.rng.getrandbits(kw) & ~1, f'0{kw}b').encode()
+            above = bytearray(border)
+            start = 0
+            for end in map(_RUN_END, _RUNS.finditer(bits)):
+                above[2*(start + int(rand() * (end-start))) + 1] = passage
+                start = end
+            yield bytes(above)
+            row = bytearray(cells)
+            row[2:w-1:2] = bits[:-1].translate(_EAST)
+            yield bytes(row)
+        yield border
+
+
+class RandomWalkMazeGenerator(MazeGenerator):
+    """
+    Base class for generators that carve the maze with random walks
+
+    The walks run over flat grid ids. Cells have odd rows and columns, so
+    the neighboring cells of id p are p + d for d in :attr:`offsets`, and
+    the wall between p and q is (p + q) // 2. A step off the grid is ruled
+    out by :method:`cell_mask` and the walk draws again.
+
+    Both algorithms generate every perfect maze with the same probability.
+    """
+    def __init__(self, **kwargs) -> None:
+        """
+        All keyword arguments are sent to the :class:`MazeGenerator`
+        constructor.
+        """
+        super().__init__(**kwargs)
+
+        # Initialize maze as a grid of walls
+        self.maze = Maze.filled(
+            CellType.WALL, height=self.height, width=self.width)
+        w = self.width
+        self.offsets = (-2*w, 2*w, -2, 2)
+        self.cells = self.cell_mask()
+        self.remaining = ((self.height-1)//2) * ((w-1)//2) - 1
+
+        start = self.maze.cell_id(self.random_cell(self.height, self.width, is_odd=True))
+        self.maze.grid[start] = CellType.PASSAGE.value
+        self.frontier = start
+
+        if self.step_mode:
+            return
+        self.carve(self.remaining)
+        self.maze.invalidate()
+        self.finished = True
+
+    def carve(self, count: int, changed: List[int] = None) -> None:
+        """
+        Adds count cells to the maze, appending the flat ids of every wall
+        and cell opened to changed if given
+        """
+        raise NotImplementedError
+
+    def step(self):
+        """
+        Each call to this function will execute a single iteration of the algorithm.
+        It is recommended to continually call this function in a loop while the finished
+        attribute is False.
+        """
+        if not self.remaining:
+            self.finished = True
+            return None
+        changed = []
+        self.carve(1, changed)
+        self.maze.invalidate()
+        return [self.maze.id_to_cell(i) for i in changed]
+
+
+class AldousBroderMazeGenerator(RandomWalkMazeGenerator):
+    """
+    Maze Generator using the Aldous-Broder Algorithm
+
+    A single random walk wanders the grid and opens the wall it crosses
+    every time it enters a cell for the first time. Each iteration walks
+    until it adds a cell, which can take many moves near the end.
+    """
+    def carve(self, count: int, changed: List[int] = None) -> None:
+        grid, cells, offsets = self.maze.grid, self.cells, self.offsets
+        size = len(grid)
+        wall, passage = CellType.WALL.value, CellType.PASSAGE.value
+        draw = self.rng.getrandbits
+        p = self.frontier
+        while count:
+            q = p + offsets[draw(2)]
+            if q < 0 or q >= size or not cells[q]:
+                continue
+            if grid[q] == wall:
+                grid[q] = grid[(p+q) >> 1] = passage
+                if changed is not None:
+                    changed += ((p+q) >> 1, q)
+                count -= 1
+                self.remaining -= 1
+            p = q
+        self.frontier = p
+
+
+class WilsonMazeGenerator(RandomWalkMazeGenerator):
+    """
+    Maze Generator using Wilson's Algorithm
+
+    Starting from a cell outside the maze, a random walk runs until it hits
+    the maze. Only the direction last taken out of each cell is stored, so
+    loops in the walk are erased as they are overwritten. The walk is then
+    retraced from its start and added to the maze. Each iteration adds one
+    such walk.
+    """
+    def __init__(self, **kwargs) -> None:
+        """
+        All keyword arguments are sent to the :class:`MazeGenerator`
+        constructor.
+        """
+        # Cells not yet in the maze are started from in row-major order
+        self.next_start = 0
+        super().__init__(**kwargs)
+
+    def carve(self, count: int, changed: List[int] = None) -> None:
+        grid, cells, offsets = self.maze.grid, self.cells, self.offsets
+        size = len(grid)
+        passage = CellType.PASSAGE.value
+        draw = self.rng.getrandbits
+        # The direction last taken out of each cell. Reuses the cell mask,
+        # storing the offset index plus one so cells stay non-zero
+        dirs = self.cells
+        start = self.next_start
+        while count > 0:
+            while not cells[start] or grid[start] == passage:
+                start += 1
+            p = start
+            while grid[p] != passage:
+                d = draw(2)
+                q = p + offsets[d]
+                if q < 0 or q >= size or not cells[q]:
+                    continue
+                dirs[p] = d + 1
+                p = q
+
+            p = start
+            while grid[p] != passage:
+                q = p + offsets[dirs[p] - 1]
+                grid[p] = grid[(p+q) >> 1] = passage
+                if changed is not None:
+                    changed += (p, (p+q) >> 1)
+                count -= 1
+                self.remaining -= 1
+                p = q
+        self.next_start = start
+
+
+# Maps each MazeGenMethods value to the class implementing it
+GENERATORS = {
+    MazeGenMethods.RDFS: RDFSMazeGenerator,
+    MazeGenMethods.RPA: RPAMazeGenerator,
+    MazeGenMethods.KRUSKAL: KruskalMazeGenerator,
+    MazeGenMethods.ELLER: EllerMazeGenerator,
+    MazeGenMethods.BINARY_TREE: BinaryTreeMazeGenerator,
+    MazeGenMethods.SIDEWINDER: SidewinderMazeGenerator,
+    MazeGenMethods.ALDOUS_BRODER: AldousBroderMazeGenerator,
+    MazeGenMethods.WILSON: WilsonMazeGenerator,
+}
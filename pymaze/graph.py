@@ -0,0 +1,151 @@
+"""
+This file contains the corridor-contracted junction graph of a maze.
+
+Most passages in a maze are corridor cells with exactly two neighboring
+passages. A JunctionGraph keeps only the other passages (junctions and dead
+ends) plus any terminal cells, such as the start and finish, as nodes. Every
+corridor between two nodes becomes a single weighted edge whose weight is
+the number of steps along the corridor.
+
+Solvers that support weighted edges can search the graph instead of the grid
+by passing graph=JunctionGraph(maze) to their constructor. The path found is
+expanded back into every :class:`Cell` along the corridors, so the solution
+is the same as a search over the full grid.
+
+The graph is a snapshot of the maze when it was built. It must be rebuilt
+after the maze changes.
+"""
+
+from array import array
+from typing import Iterable, List
+
+from pymaze.maze import Maze, Cell, CellType
+from pymaze.utils import index_typecode
+
+
+class JunctionGraph:
+    """
+    Weighted graph of the junctions, dead ends and terminals of a maze
+
+    Nodes are numbered 0 to size-1. Edges are stored in CSR form: the edges
+    leaving node n are the slice offsets[n]:offsets[n+1] of the targets,
+    weights and firsts arrays. firsts holds the flat id of the first corridor
+    cell of each edge and is used to walk the corridor again when expanding
+    a path.
+    """
+
+    def __init__(self, maze: Maze, terminals: Iterable[Cell] = None) -> None:
+        """
+        Build the junction graph of maze
+
+        Parameters
+        ----------
+        maze: Maze
+            The maze to contract
+        terminals: Iterable[Cell], optional
+            Cells that must be nodes of the graph even if they are corridor
+            cells. Defaults to the start and finish of the maze
+        """
+        self.maze = maze
+        if terminals is None:
+            terminals = (maze.start_pos, maze.finish_pos)
+        self.adjacency = maze.build_adjacency()
+        offsets, neighbors = self.adjacency
+
+        size = maze.height * maze.width
+        typecode = index_typecode(size)
+        self.cells = array(typecode)
+        self.node_of = {}
+        for c in terminals:
+            if c is not None and maze.is_passage(c):
+                self._add_node(maze.cell_id(c))
+        for i in range(size):
+            degree = offsets[i+1] - offsets[i]
+            if degree != 2 and maze.grid[i] != CellType.WALL.value:
+                self._add_node(i)
+
+        self.offsets = array(typecode, [0])
+        self.targets = array(typecode)
+        self.weights = array(typecode)
+        self.firsts = array(typecode)
+        for i in self.cells:
+            for n in neighbors[offsets[i]:offsets[i+1]]:
+                end, weight = self._walk(i, n)
+                self.targets.append(self.node_of[end])
+                self.weights.append(weight)
+                self.firsts.append(n)
+            self.offsets.append(len(self.targets))
+
+    def _add_node(self, i: int) -> None:
+        if i not in self.node_of:
+            self.node_of[i] = len(self.cells)
+            self.cells.append(i)
+
+    def _walk(self, prev: int, cur: int) -> tuple:
+        """
+        Follows the corridor entered from node prev through cell cur and
+        returns the node it ends at and its length
+        """
+        offsets, neighbors = self.adjacency
+        weight = 1
+        while cur not in self.node_of:
+            a, b = neighbors[offsets[cur]:offsets[cur+1]]
+            prev, cur = cur, (b if a == prev else a)
+            weight += 1
+        return cur, weight
+
+    @property
+    def size(self) -> int:
+        """
+        The number of nodes in the graph
+        """
+        return len(self.cells)
+
+    def node(self, c: Cell) -> int:
+        """
+        Returns the node of cell c
+        """
+        try:
+            return self.node_of[self.maze.cell_id(c)]
+        except KeyError:
+            raise ValueError(f'{c} is not a node of the junction graph')
+
+    def cell(self, n: int) -> Cell:
+        """
+        Returns the :class:`Cell` of node n
+        """
+        return self.maze.id_to_cell(self.cells[n])
+
+    def neighbors(self, n: int):
+        """
+        Returns the nodes adjacent to node n
+        """
+        return self.targets[self.offsets[n]:self.offsets[n+1]]
+
+    def edges(self, n: int):
+        """
+        Returns (node, weight) pairs for the edges leaving node n
+        """
+        a, b = self.offsets[n], self.offsets[n+1]
+        return zip(self.targets[a:b], self.weights[a:b])
+
+    def corridor(self, u: int, v: int) -> List[int]:
+        """
+        Returns the flat ids of the cells along the shortest edge from node u
+        to node v, excluding u and including v
+        """
+        a, b = self.offsets[u], self.offsets[u+1]
+        best = None
+        for e in range(a, b):
+            if self.targets[e] == v and (best is None or self.weights[e] < self.weights[best]):
+                best = e
+        if best is None:
+            raise ValueError(f'Nodes {u} and {v} are not adjacent')
+        offsets, neighbors = self.adjacency
+        prev, cur = self.cells[u], self.firsts[best]
+        path = [cur]
+        while cur not in self.node_of:
+            a, b = neighbors[offsets[cur]:offsets[cur+1]]
+            prev, cur = cur, (b if a == prev else a)
+            path.append(cur)
+        return path
@@ -48,7 +48,13 @@ class GenerateWindow(ActionBaseWindow):
         self.method_label = tk.Label(self, text='Method')
         self.method_combo = ttk.Combobox(
             self, values=[MazeGenMethods.RDFS,
-                          MazeGenMethods.RPA], state='readonly'
+                          MazeGenMethods.RPA,
+                          MazeGenMethods.KRUSKAL,
+                          MazeGenMethods.ELLER,
+                          MazeGenMethods.BINARY_TREE,
+                          MazeGenMethods.SIDEWINDER,
+                          MazeGenMethods.ALDOUS_BRODER,
+                          MazeGenMethods.WILSON], state='readonly'
         )
         self.method_combo.current(0)
         self.height_label = tk.Label(self, text='Maze Height')
@@ -97,7 +103,9 @@ class SolveWindow(ActionBaseWindow):
         self.method_label = tk.Label(self, text='Method')
         self.method_combo = ttk.Combobox(
             self, values=[MazeSolverMethods.DFS, MazeSolverMethods.BFS,
-                          MazeSolverMethods.UCS, MazeSolverMethods.ASTAR], state='readonly'
+                          MazeSolverMethods.UCS, MazeSolverMethods.ASTAR,
+                          MazeSolverMethods.BIBFS, MazeSolverMethods.BIASTAR,
+                          MazeSolverMethods.JPS], state='readonly'
         )
         self.method_combo.current(0)
         self.heuristic_label = tk.Label(self, text='Heuristic')
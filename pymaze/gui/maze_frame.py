@@ -2,9 +2,13 @@ import tkinter as tk
 
 from pymaze.gui.states import AppState
 from pymaze.maze import Maze, Cell, CellType
-from pymaze.generators import MazeGenMethods, RPAMazeGenerator, RDFSMazeGenerator
+from pymaze.generators import (
+    MazeGenMethods, RPAMazeGenerator, RDFSMazeGenerator, KruskalMazeGenerator,
+    EllerMazeGenerator, BinaryTreeMazeGenerator, SidewinderMazeGenerator,
+    AldousBroderMazeGenerator, WilsonMazeGenerator)
 from pymaze.solvers import (
-    MazeSolverMethods, DFSMazeSolver, BFSMazeSolver, UCSMazeSolver, ASTARMazeSolver)
+    MazeSolverMethods, DFSMazeSolver, BFSMazeSolver, UCSMazeSolver, ASTARMazeSolver,
+    BiBFSMazeSolver, BiASTARMazeSolver, JPSMazeSolver)
 
 
 class MazeCanvas(tk.Canvas):
@@ -50,6 +54,18 @@ class MazeCanvas(tk.Canvas):
                 g = RDFSMazeGenerator(height=height, width=width, step=True)
             elif method == MazeGenMethods.RPA:
                 g = RPAMazeGenerator(height=height, width=width, step=True)
+            elif method == MazeGenMethods.KRUSKAL:
+                g = KruskalMazeGenerator(height=height, width=width, step=True)
+            elif method == MazeGenMethods.ELLER:
+                g = EllerMazeGenerator(height=height, width=width, step=True)
+            elif method == MazeGenMethods.BINARY_TREE:
+                g = BinaryTreeMazeGenerator(height=height, width=width, step=True)
+            elif method == MazeGenMethods.SIDEWINDER:
+                g = SidewinderMazeGenerator(height=height, width=width, step=True)
+            elif method == MazeGenMethods.ALDOUS_BRODER:
+                g = AldousBroderMazeGenerator(height=height, width=width, step=True)
+            elif method == MazeGenMethods.WILSON:
+                g = WilsonMazeGenerator(height=height, width=width, step=True)
             else:
                 self.app.revert_state()
                 raise ValueError('Invalid method')
@@ -95,6 +111,12 @@ class MazeCanvas(tk.Canvas):
             s = UCSMazeSolver(self.maze, step=True)
         elif method == MazeSolverMethods.ASTAR:
             s = ASTARMazeSolver(self.maze, step=True)
+        elif method == MazeSolverMethods.BIBFS:
+            s = BiBFSMazeSolver(self.maze, step=True)
+        elif method == MazeSolverMethods.BIASTAR:
+            s = BiASTARMazeSolver(self.maze, step=True)
+        elif method == MazeSolverMethods.JPS:
+            s = JPSMazeSolver(self.maze, step=True)
         else:
             self.app.revert_state()
             raise ValueError('Invalid method')
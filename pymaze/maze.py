@@ -1,8 +1,13 @@
 from __future__ import annotations
 from enum import Enum
-from typing import List
+from typing import List, Tuple
 from collections import namedtuple
+from array import array
+import inspect
+import io
+import mmap
 import random
+import weakref
 
 
 class CellType(Enum):
@@ -14,20 +19,51 @@ class CellType(Enum):
 
 Cell = namedtuple('Cell', ['row', 'col'])
 
+# CellType members indexed by their value, used to decode grid bytes
+_CELL_TYPES = tuple(CellType)
+_WALL = CellType.WALL.value
+
+# Number of cells written to a txt file at a time
+_TEXT_CHUNK = 1 << 20
+
+# Marks characters that do not belong to any CellType when reading files
+_INVALID = 255
+
+# The content hash reads the grid as a base 256 number modulo two primes. They
+# must not be Mersenne primes: 256**61 is 1 modulo 2**61 - 1, so cells 61 apart
+# would get the same weight. These are the two largest safe primes p = 2q + 1
+# below 2**61. 256 is a square, so its order modulo p is the prime q, about
+# 2**60, and no two cells of any maze share a weight. Two grids get the same
+# hash only if their difference is divisible by both primes
+_HASH_MODS = ((1 << 61) - 2373, (1 << 61) - 3153)
+
 
 class Maze:
 
-    def __init__(self, maze: List[List[CellType]], **kwargs) -> None:
+    def __init__(self, maze: List[List[CellType]] = None, **kwargs) -> None:
         """
         Create a :class:`Maze` object given a 2D list of CellTypes
 
+        The grid is stored as a flat ``bytearray`` of :class:`CellType` values
+        in row-major order, so each cell costs a single byte. Cell (row, col)
+        lives at index ``row*width + col`` of the grid attribute.
+
         Parameters
         ----------
-        maze: List[List[CellType]]
+        maze: List[List[CellType]], optional
             a 2D list of CellTypes
         """
 
-        self.maze = maze
+        self.grid = bytearray()
+        self._height = 0
+        self._width = 0
+        if maze:
+            self._height = len(maze)
+            self._width = len(maze[0])
+            for row in maze:
+                if len(row) != self._width:
+                    raise ValueError('All maze rows must have the same width')
+                self.grid.extend(c.value for c in row)
 
         self.wall_char = kwargs.pop('wall_char', '%')
         self.passage_char = kwargs.pop('passage_char', ' ')
@@ -37,11 +73,44 @@ class Maze:
         self.start_pos = None
         self.finish_pos = None
 
+        self._adjacency = None
+        self._hash = None
+        self._listeners = []
+
+    @classmethod
+    def from_buffer(cls, grid, height: int, width: int, **kwargs) -> Maze:
+        """
+        Create a :class:`Maze` object from a flat buffer of CellType values
+
+        Keyword arguments are send to the :class:`Maze` constructor
+
+        Parameters
+        ----------
+        grid: bytearray
+            The row-major cell values. The buffer is used as is, not copied
+        height: int
+            The number of rows in the maze
+        width: int
+            The number of columns in the maze
+        """
+        if len(grid) != height * width:
+            raise ValueError(
+                f'Buffer of size {len(grid)} does not fit a {height}x{width} maze')
+        self = cls(None, **kwargs)
+        self.grid = grid
+        self._height = height
+        self._width = width
+        return self
+
     @classmethod
     def from_file(cls, filename: str, **kwargs) -> Maze:
         """
         Create a :class:`Maze` object from a txt file
 
+        The file is memory-mapped when possible and read one row at a time.
+        Each row is translated to cell values in a single call, so only the
+        compact grid is kept in memory.
+
         Keyword arguments are send to the :class:`Maze` constructor
 
         Parameters
@@ -50,36 +119,106 @@ class Maze:
             The name of the file to read
 
         """
-        self = cls([], **kwargs)
-        with open(filename, 'r') as f:
-            for row, line in enumerate(f.readlines()):
-                cells = []
-                for col, c in enumerate(line):
-                    if c == self.wall_char:
-                        cells.append(CellType.WALL)
-                    elif c == self.passage_char:
-                        cells.append(CellType.PASSAGE)
-                    elif c == self.start_char:
-                        self.start_pos = Cell(row, col)
-                        cells.append(CellType.START)
-                    elif c == self.finish_char:
-                        self.finish_pos = Cell(row, col)
-                        cells.append(CellType.FINISH)
-                    elif c == '\n':
-                        break
-                    else:
-                        raise ValueError(f'Invalid character: {c}')
-                self.maze.append(cells)
+        self = cls(None, **kwargs)
+        decode = self._row_decoder()
+        with open(filename, 'rb') as f:
+            for line in _iter_lines(f):
+                line = line.rstrip(b'\r\n')
+                if not line:
+                    continue
+                cells = decode(line)
+                if self._width and len(cells) != self._width:
+                    raise ValueError(f'Row {self._height} has an invalid width')
+                col = cells.rfind(CellType.START.value)
+                if col != -1:
+                    self.start_pos = Cell(self._height, col)
+                col = cells.rfind(CellType.FINISH.value)
+                if col != -1:
+                    self.finish_pos = Cell(self._height, col)
+                self.grid += cells
+                self._width = len(cells)
+                self._height += 1
         return self
 
+    def _chars(self) -> dict:
+        """
+        Returns the character used for each :class:`CellType` value
+        """
+        return {
+            CellType.WALL.value: self.wall_char,
+            CellType.PASSAGE.value: self.passage_char,
+            CellType.START.value: self.start_char,
+            CellType.FINISH.value: self.finish_char}
+
+    def _row_decoder(self):
+        """
+        Returns a function that translates one encoded row of a txt file to
+        cell values, raising a ValueError on invalid characters
+        """
+        chars = self._chars()
+        if all(len(c.encode()) == 1 for c in chars.values()):
+            table = bytearray([_INVALID]) * 256
+            for val, c in chars.items():
+                table[ord(c)] = val
+
+            def decode(line: bytes) -> bytes:
+                cells = line.translate(table)
+                if _INVALID in cells:
+                    bad = line[cells.index(_INVALID):].decode(errors='replace')[0]
+                    raise ValueError(f'Invalid character: {bad}')
+                return cells
+        else:
+            # Multi-byte characters need the line decoded first. Characters
+            # missing from a str.translate table are kept, so every other
+            # character is found by deleting the valid ones first
+            table = {ord(c): val for val, c in chars.items()}
+            valid = dict.fromkeys(table)
+
+            def decode(line: bytes) -> bytes:
+                text = line.decode()
+                bad = text.translate(valid)
+                if bad:
+                    raise ValueError(f'Invalid character: {bad[0]}')
+                return bytes(text.translate(table), 'latin-1')
+        return decode
+
     @classmethod
-    def empty(cls, **kwargs) -> Maze:
-        self = cls(None, **kwargs)
+    def filled(cls, val: CellType, **kwargs) -> Maze:
+        """
+        Create a :class:`Maze` object where every cell is val
+
+        Keyword arguments are send to the :class:`Maze` constructor
+
+        Keyword Arguments
+        -----------------
+        height: int, default=75
+            The height of the maze
+        width: int, default=105
+            The width of the maze
+        """
         height = kwargs.pop('height', 75)
         width = kwargs.pop('width', 105)
-        self.maze = [[CellType.PASSAGE for _ in range(
-            width)] for _ in range(height)]
-        return self
+        return cls.from_buffer(
+            bytearray([val.value]) * (height * width), height, width, **kwargs)
+
+    @classmethod
+    def empty(cls, **kwargs) -> Maze:
+        """
+        Shortcut for creating a maze of all passages. See :method:`filled`
+        """
+        return cls.filled(CellType.PASSAGE, **kwargs)
+
+    def cell_id(self, c: Cell) -> int:
+        """
+        Returns the flat index of c in the grid
+        """
+        return c.row * self._width + c.col
+
+    def id_to_cell(self, i: int) -> Cell:
+        """
+        Returns the :class:`Cell` at flat index i of the grid
+        """
+        return Cell(*divmod(i, self._width))
 
     def get(self, c: Cell) -> CellType:
         """
@@ -87,7 +226,7 @@ class Maze:
         """
         if not self.is_valid_cell(c):
             raise ValueError(f'Invalid Cell: {c}')
-        return self.maze[c.row][c.col]
+        return _CELL_TYPES[self.grid[c.row * self._width + c.col]]
 
     def set(self, c: Cell, val: CellType) -> None:
         """
@@ -95,7 +234,55 @@ class Maze:
         """
         if not self.is_valid_cell(c):
             raise ValueError(f'Invalid Cell: {c}')
-        self.maze[c.row][c.col] = val
+        i = c.row * self._width + c.col
+        old = self.grid[i]
+        self.grid[i] = val.value
+        if old == val.value:
+            return
+        self._adjacency = None
+        if self._hash is not None:
+            diff = val.value - old
+            self._hash = tuple((h + diff * pow(256, i, m)) % m
+                               for h, m in zip(self._hash, _HASH_MODS))
+        if self._listeners:
+            self._notify(c)
+
+    def add_listener(self, listener) -> None:
+        """
+        Registers a function that is called with the cell every time
+        :method:`set` changes a cell. Direct writes to the grid attribute
+        are not reported.
+
+        Only a weak reference to the listener is kept, so registering a
+        bound method does not keep its object alive. References to listeners
+        that have been garbage collected are dropped here and on every change
+        """
+        self._listeners = [r for r in self._listeners if r() is not None]
+        if inspect.ismethod(listener):
+            self._listeners.append(weakref.WeakMethod(listener))
+        else:
+            self._listeners.append(weakref.ref(listener))
+
+    def remove_listener(self, listener) -> None:
+        """
+        Unregisters a function added with :method:`add_listener`
+        """
+        self._listeners = [r for r in self._listeners if r() not in (None, listener)]
+
+    def __getstate__(self) -> dict:
+        # Listeners are weak references, which cannot be pickled
+        state = self.__dict__.copy()
+        state['_listeners'] = []
+        return state
+
+    def _notify(self, c: Cell) -> None:
+        alive = []
+        for r in self._listeners:
+            listener = r()
+            if listener is not None:
+                listener(c)
+                alive.append(r)
+        self._listeners = alive
 
     def is_valid_cell(self, c: Cell) -> bool:
         """
@@ -103,19 +290,23 @@ class Maze:
         """
         if not c:
             return False
-        return (0 <= c.row < len(self.maze)) and (0 <= c.col < len(self.maze[0]))
+        return (0 <= c.row < self._height) and (0 <= c.col < self._width)
 
     def is_passage(self, c: Cell) -> bool:
         """
         Returns True if the cell is a passage
         """
-        return self.get(c) != CellType.WALL
+        if not self.is_valid_cell(c):
+            raise ValueError(f'Invalid Cell: {c}')
+        return self.grid[c.row * self._width + c.col] != _WALL
 
     def is_wall(self, c: Cell) -> bool:
         """
         Returns True if the cell is a wall
         """
-        return self.get(c) == CellType.WALL
+        if not self.is_valid_cell(c):
+            raise ValueError(f'Invalid Cell: {c}')
+        return self.grid[c.row * self._width + c.col] == _WALL
 
     def get_neighboring_cells(self, c: Cell, d: int = 1) -> List[Cell]:
         """
@@ -153,6 +344,74 @@ class Maze:
         """
         return [n for n in self.get_neighboring_cells(c, d) if self.is_passage(n)]
 
+    @property
+    def adjacency(self) -> Tuple[array, array]:
+        """
+        The passage adjacency index built by :method:`build_adjacency`, or
+        None if it has not been built since the maze was last changed
+        """
+        return self._adjacency
+
+    def build_adjacency(self) -> Tuple[array, array]:
+        """
+        Build the passage adjacency index of the maze in CSR form
+
+        The index is built once and cached until the maze is changed. It
+        holds two arrays over flat cell ids: offsets and neighbors. The
+        passages adjacent to passage i are neighbors[offsets[i]:offsets[i+1]],
+        in the same order as :method:`get_neighboring_passages`. Walls have
+        no neighbors in the index.
+
+        Returns
+        -------
+        Tuple[array, array]
+            The offsets and neighbors arrays
+        """
+        if self._adjacency is not None:
+            return self._adjacency
+        grid = self.grid
+        h, w = self._height, self._width
+        offsets = array('l', [0])
+        neighbors = array('l')
+        for i in range(h * w):
+            if grid[i] != _WALL:
+                row, col = divmod(i, w)
+                if row + 1 < h and grid[i+w] != _WALL:
+                    neighbors.append(i+w)
+                if row > 0 and grid[i-w] != _WALL:
+                    neighbors.append(i-w)
+                if col + 1 < w and grid[i+1] != _WALL:
+                    neighbors.append(i+1)
+                if col > 0 and grid[i-1] != _WALL:
+                    neighbors.append(i-1)
+            offsets.append(len(neighbors))
+        self._adjacency = (offsets, neighbors)
+        return self._adjacency
+
+    def invalidate(self) -> None:
+        """
+        Discard cached indexes of the maze. This must be called after
+        writing to the grid attribute directly instead of using :method:`set`
+        """
+        self._adjacency = None
+        self._hash = None
+
+    @property
+    def content_hash(self) -> int:
+        """
+        A 122-bit hash of the cell values in the grid, made of two
+        independent 61-bit hashes. Every cell has its own weight in both, so
+        changing any one cell always changes the hash
+
+        The hash is computed once and then kept up to date by :method:`set`
+        in constant time, so it is cheap to read after every change. It does
+        not include the dimensions of the maze.
+        """
+        if self._hash is None:
+            n = int.from_bytes(self.grid, 'little')
+            self._hash = tuple(n % m for m in _HASH_MODS)
+        return self._hash[0] << 61 | self._hash[1]
+
     def to_file(self, filename: str) -> None:
         """
         Write the maze to a txt file
@@ -164,23 +423,87 @@ class Maze:
             will be created
         """
         with open(filename, 'w') as f:
-            f.write(self.__str__())
+            for chunk in self._text_chunks():
+                f.write(chunk)
+
+    @classmethod
+    def from_binary(cls, filename: str, index: int = 0, **kwargs) -> Maze:
+        """
+        Create a :class:`Maze` object from a binary maze file. See
+        :mod:`pymaze.mazefile` for the format
+
+        Keyword arguments are send to the :class:`Maze` constructor
+
+        Parameters
+        ----------
+        filename: str
+            The name of the file to read
+        index: int, default=0
+            The position of the maze in the file
+        """
+        from pymaze import mazefile
+        return mazefile.load(filename, index, **kwargs)
+
+    def to_binary(self, filename: str, append: bool = False, **metadata) -> None:
+        """
+        Write the maze to a binary maze file, which takes a bit per cell.
+        See :mod:`pymaze.mazefile` for the format
+
+        Parameters
+        ----------
+        filename: str
+            The name of the file to write to
+        append: bool, default=False
+            If True, the maze is added after the mazes already in the file
+
+        Other keyword arguments, such as the generator and seed, are stored
+        in the metadata of the file
+        """
+        from pymaze import mazefile
+        mazefile.save(filename, self, append, **metadata)
 
     @property
     def height(self):
-        return len(self.maze)
+        return self._height
 
     @property
     def width(self):
-        return len(self.maze[0])
+        return self._width
+
+    def _text_chunks(self):
+        """
+        Yields the text form of the maze in chunks of whole rows. Each chunk
+        is translated from the grid in bulk instead of cell by cell
+        """
+        w = self._width
+        if not w:
+            return
+        table = {val: c for val, c in self._chars().items()}
+        step = w * max(1, _TEXT_CHUNK // w)
+        for i in range(0, len(self.grid), step):
+            block = str(self.grid[i:i+step], 'latin-1')
+            yield '\n'.join(
+                block[j:j+w].translate(table) for j in range(0, len(block), w)) + '\n'
 
     def __str__(self) -> str:
-        output = ''
-        maps = {
-            CellType.PASSAGE: self.passage_char,
-            CellType.WALL: self.wall_char,
-            CellType.START: self.start_char,
-            CellType.FINISH: self.finish_char}
-        for row in self.maze:
-            output += ''.join([maps[c] for c in row]) + '\n'
-        return output
+        return ''.join(self._text_chunks())
+
+
+def _iter_lines(f):
+    """
+    Yields the lines of binary file f, memory-mapping it when possible
+    """
+    try:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (ValueError, OSError, io.UnsupportedOperation):
+        # Empty files and streams cannot be mapped
+        yield from f
+        return
+    with mm:
+        pos = 0
+        size = len(mm)
+        while pos < size:
+            end = mm.find(b'\n', pos)
+            end = size if end == -1 else end + 1
+            yield mm[pos:end]
+            pos = end
@@ -0,0 +1,206 @@
+"""
+This file contains the compact binary maze file format.
+
+A file holds one or more maze records back to back. Each record is:
+
+- A fixed header: the magic bytes b'PYMZ', the format version, the height
+  and width of the maze, the start and finish cells (-1 when not set) and
+  the length of the metadata that follows
+- The metadata as UTF-8 JSON. It always holds the character map used when
+  the maze is written as text, plus any extra fields given when writing,
+  such as the generator and seed
+- The wall bitmap: one bit per cell, set for passages, rows padded to a
+  whole number of bytes and the first cell of a row in the highest bit
+
+The bitmap takes an eighth of the space of the text format. Files are
+memory-mapped when loaded, so the header can be read and a maze unpacked
+without reading the whole file first.
+"""
+
+import json
+import mmap
+import struct
+from collections import namedtuple
+from typing import BinaryIO, Iterator
+
+from pymaze.maze import Maze, Cell, CellType
+
+MAGIC = b'PYMZ'
+VERSION = 1
+
+_HEADER = struct.Struct('<4sBxxxIIiiiiI')
+
+# Translates cell values to bitmap digits and back
+_TO_BITS = bytes.maketrans(bytes([
+    CellType.WALL.value, CellType.PASSAGE.value,
+    CellType.START.value, CellType.FINISH.value]), b'0111')
+_FROM_BITS = bytes.maketrans(b'01', bytes([
+    CellType.WALL.value, CellType.PASSAGE.value]))
+
+MazeFileHeader = namedtuple('MazeFileHeader', [
+    'height', 'width', 'start_pos', 'finish_pos', 'metadata', 'offset', 'size'])
+MazeFileHeader.__doc__ = """
+Header of a maze record. offset is the position of the bitmap in the file
+and size the length of the whole record in bytes
+"""
+
+
+def row_bytes(width: int) -> int:
+    """
+    Returns the number of bitmap bytes used by a row of width cells
+    """
+    return (width + 7) // 8
+
+
+def pack_row(cells: bytes) -> bytes:
+    """
+    Packs one row of cell values into its bitmap bytes
+    """
+    width = len(cells)
+    n = row_bytes(width)
+    bits = cells.translate(_TO_BITS) + b'0' * (n*8 - width)
+    return int(bits, 2).to_bytes(n, 'big')
+
+
+def unpack_row(data: bytes, width: int) -> bytes:
+    """
+    Unpacks the bitmap bytes of one row into wall and passage values
+    """
+    bits = format(int.from_bytes(data, 'big'), f'0{len(data)*8}b')
+    return bits.encode()[:width].translate(_FROM_BITS)
+
+
+def write_header(f: BinaryIO, height: int, width: int, start_pos: Cell = None,
+                 finish_pos: Cell = None, **metadata) -> None:
+    """
+    Writes the header and metadata of a record. The caller then has to
+    write exactly height packed rows
+    """
+    meta = json.dumps(metadata).encode()
+    f.write(_HEADER.pack(
+        MAGIC, VERSION, height, width,
+        start_pos.row if start_pos else -1, start_pos.col if start_pos else -1,
+        finish_pos.row if finish_pos else -1, finish_pos.col if finish_pos else -1,
+        len(meta)))
+    f.write(meta)
+
+
+def write_maze(f: BinaryIO, maze: Maze, **metadata) -> None:
+    """
+    Writes maze as one record to the binary file f
+
+    Keyword arguments are stored in the metadata of the record
+    """
+    metadata.setdefault('chars', [
+        maze.wall_char, maze.passage_char, maze.start_char, maze.finish_char])
+    write_header(f, maze.height, maze.width, maze.start_pos, maze.finish_pos, **metadata)
+    w = maze.width
+    for i in range(0, maze.height * w, w):
+        f.write(pack_row(bytes(maze.grid[i:i+w])))
+
+
+def read_header(buf, pos: int = 0) -> MazeFileHeader:
+    """
+    Reads the header of the record starting at pos of buf, which can be
+    bytes or a memory map
+    """
+    fields = _HEADER.unpack_from(buf, pos)
+    magic, version, height, width, sr, sc, fr, fc, meta_len = fields
+    if magic != MAGIC:
+        raise ValueError('Not a maze file')
+    if version != VERSION:
+        raise ValueError(f'Unsupported maze file version: {version}')
+    offset = pos + _HEADER.size + meta_len
+    metadata = json.loads(bytes(buf[pos+_HEADER.size:offset]))
+    return MazeFileHeader(
+        height, width,
+        Cell(sr, sc) if sr >= 0 else None,
+        Cell(fr, fc) if fr >= 0 else None,
+        metadata, offset, offset - pos + height*row_bytes(width))
+
+
+def read_maze(buf, pos: int = 0, **kwargs) -> Maze:
+    """
+    Reads the record starting at pos of buf into a :class:`Maze`
+
+    Keyword arguments are send to the :class:`Maze` constructor and
+    override the character map stored in the file
+    """
+    header = read_header(buf, pos)
+    chars = header.metadata.get('chars')
+    if chars:
+        for name, c in zip(('wall_char', 'passage_char', 'start_char', 'finish_char'), chars):
+            kwargs.setdefault(name, c)
+    n = row_bytes(header.width)
+    grid = bytearray()
+    for i in range(header.offset, header.offset + header.height*n, n):
+        grid += unpack_row(buf[i:i+n], header.width)
+    maze = Maze.from_buffer(grid, header.height, header.width, **kwargs)
+    if header.start_pos:
+        maze.set(header.start_pos, CellType.START)
+        maze.start_pos = header.start_pos
+    if header.finish_pos:
+        maze.set(header.finish_pos, CellType.FINISH)
+        maze.finish_pos = header.finish_pos
+    return maze
+
+
+def iter_headers(filename: str) -> Iterator[MazeFileHeader]:
+    """
+    Yields the header of every record in a binary maze file without
+    unpacking any bitmap
+    """
+    with open(filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        pos = 0
+        while pos < len(mm):
+            header = read_header(mm, pos)
+            yield header
+            pos += header.size
+
+
+def iter_mazes(filename: str, **kwargs) -> Iterator[Maze]:
+    """
+    Yields every maze in a binary maze file
+
+    Keyword arguments are send to the :class:`Maze` constructor
+    """
+    with open(filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        pos = 0
+        while pos < len(mm):
+            yield read_maze(mm, pos, **kwargs)
+            pos += read_header(mm, pos).size
+
+
+def load(filename: str, index: int = 0, **kwargs) -> Maze:
+    """
+    Loads the maze at position index of a binary maze file. Only the
+    headers of the records before it are read
+
+    Keyword arguments are send to the :class:`Maze` constructor
+    """
+    with open(filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        pos = 0
+        for _ in range(index):
+            if pos >= len(mm):
+                break
+            pos += read_header(mm, pos).size
+        if pos >= len(mm):
+            raise IndexError(f'No maze at index {index} in {filename}')
+        return read_maze(mm, pos, **kwargs)
+
+
+def save(filename: str, maze: Maze, append: bool = False, **metadata) -> None:
+    """
+    Writes maze to a binary maze file
+
+    Parameters
+    ----------
+    filename: str
+        The name of the file to write to
+    append: bool, default=False
+        If True, the maze is added after the records already in the file
+
+    Other keyword arguments are stored in the metadata of the record
+    """
+    with open(filename, 'ab' if append else 'wb') as f:
+        write_maze(f, maze, **metadata)
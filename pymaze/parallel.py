@@ -0,0 +1,362 @@
+"""
+This file contains the parallel APIs, which spread work over a pool of
+worker processes.
+
+Batch generation runs many generation jobs at once. Each job names its
+generator, size, loop chance and seed, and every job gets its own
+random.Random seeded with its seed, so a job generates the same maze no
+matter which worker runs it or in which order. Finished mazes are either
+streamed back to the caller or written by the workers straight to sharded
+binary maze files (see :mod:`pymaze.mazefile`), so the mazes never have to
+be sent between processes.
+
+Tiled generation builds one giant maze from tiles generated in parallel.
+The cells of the maze are split into rectangular tiles and each tile is
+generated as its own maze by a worker, with any generator. The tiles are
+then stitched together by opening passages in the walls between them: one
+passage for each edge of a random spanning tree of the tiles, which keeps
+the maze perfect, or one passage between every pair of neighboring tiles.
+
+Portfolio solving runs several solvers on the same maze at once, each in
+its own process, and returns the first solution good enough for the
+caller. Which solver is fastest depends on the shape of the maze, so the
+portfolio gets the best latency without having to guess. The other
+processes are terminated as soon as there is a winner. Unless the workers
+are forked, the maze is handed to them through shared memory (see
+:mod:`pymaze.shared`).
+"""
+
+import multiprocessing
+import os
+import queue
+import random
+import time
+from array import array
+from collections import namedtuple
+from typing import Iterable, Iterator, List, Tuple
+
+from pymaze import mazefile
+from pymaze.maze import Maze, Cell, CellType
+from pymaze.generators import GENERATORS
+from pymaze.shared import SharedMaze, SharedMazeHandle, attach
+from pymaze.solvers import MazeSolverMethods, SOLVERS
+from pymaze.utils import DisjointSet, index_typecode
+
+GenerationJob = namedtuple(
+    'GenerationJob', ['method', 'height', 'width', 'loop', 'seed'],
+    defaults=(0.0, None))
+GenerationJob.__doc__ = """
+A maze generation job. method is a MazeGenMethods value and loop the chance
+passed to loopify. Jobs with the same fields always generate the same maze
+"""
+
+
+def make_jobs(method: str, count: int, height: int, width: int,
+              loop: float = 0.0, seed: int = 0) -> List[GenerationJob]:
+    """
+    Returns count jobs of the same method and size with the seeds seed,
+    seed+1, ..., seed+count-1
+    """
+    return [GenerationJob(method, height, width, loop, seed + i) for i in range(count)]
+
+
+def generate(job: GenerationJob) -> Maze:
+    """
+    Runs a single job in the current process and returns its maze, with a
+    random start and finish
+    """
+    if job.method not in GENERATORS:
+        raise ValueError(f'Invalid method: {job.method}')
+    g = GENERATORS[job.method](height=job.height, width=job.width, seed=job.seed)
+    g.randomized_start_finish()
+    if job.loop:
+        g.loopify(chance=job.loop)
+    return g.maze
+
+
+def _generate_indexed(item: Tuple[int, GenerationJob]) -> Tuple[int, Maze]:
+    i, job = item
+    return i, generate(job)
+
+
+def _write_shard(item: Tuple[str, List[GenerationJob]]) -> str:
+    filename, jobs = item
+    with open(filename, 'wb') as f:
+        for job in jobs:
+            mazefile.write_maze(
+                f, generate(job), generator=job.method, loop=job.loop, seed=job.seed)
+    return filename
+
+
+def generate_batch(jobs: Iterable[GenerationJob], processes: int = None, ordered: bool = True,
+                   chunksize: int = 1) -> Iterator[Tuple[GenerationJob, Maze]]:
+    """
+    Runs jobs in a pool of worker processes and yields (job, maze) pairs as
+    the mazes are finished
+
+    Parameters
+    ----------
+    jobs: Iterable[GenerationJob]
+        The jobs to run
+    processes: int, optional
+        The number of worker processes. Defaults to the number of CPUs
+    ordered: bool, default=True
+        If True, mazes are yielded in the order of jobs. Otherwise each maze
+        is yielded as soon as it is done
+    chunksize: int, default=1
+        The number of jobs sent to a worker at a time. Larger chunks cut
+        the overhead of many small jobs
+    """
+    jobs = list(jobs)
+    with multiprocessing.Pool(processes) as pool:
+        run = pool.imap if ordered else pool.imap_unordered
+        for i, maze in run(_generate_indexed, enumerate(jobs), chunksize):
+            yield jobs[i], maze
+
+
+def write_batch(jobs: Iterable[GenerationJob], directory: str, shards: int = None,
+                processes: int = None, prefix: str = 'mazes') -> List[str]:
+    """
+    Runs jobs in a pool of worker processes that write the mazes to sharded
+    binary maze files. Each worker writes whole shards, so no maze is sent
+    back to this process. Every record stores its method, loop chance and
+    seed in its metadata
+
+    Parameters
+    ----------
+    jobs: Iterable[GenerationJob]
+        The jobs to run. Job i is written to shard i % shards
+    directory: str
+        The directory to write the shards to. It is created if needed
+    shards: int, optional
+        The number of files to write. Defaults to the number of processes
+    processes: int, optional
+        The number of worker processes. Defaults to the number of CPUs
+    prefix: str, default='mazes'
+        Shard k is named f'{prefix}-{k:05d}.pymz'
+
+    Returns
+    -------
+    List[str]
+        The names of the shard files
+    """
+    jobs = list(jobs)
+    if shards is None:
+        shards = processes or os.cpu_count() or 1
+    shards = max(1, min(shards, len(jobs)))
+    os.makedirs(directory, exist_ok=True)
+    items = [(os.path.join(directory, f'{prefix}-{k:05d}.pymz'), jobs[k::shards])
+             for k in range(shards)]
+    with multiprocessing.Pool(processes) as pool:
+        return pool.map(_write_shard, items, 1)
+
+
+def _tile_bounds(cells: int, tile_cells: int) -> List[int]:
+    """
+    Splits cells rows or columns of cells into tiles of tile_cells each.
+    A last tile of less than 2 cells is merged into the one before it,
+    since generators need at least 2 cells per side
+    """
+    bounds = list(range(0, cells, tile_cells)) + [cells]
+    if len(bounds) > 2 and bounds[-1] - bounds[-2] < 2:
+        del bounds[-2]
+    return bounds
+
+
+def _generate_tile(item: Tuple[int, str, int, int, int]) -> Tuple[int, bytearray]:
+    i, method, height, width, seed = item
+    return i, GENERATORS[method](height=height, width=width, seed=seed).maze.grid
+
+
+def generate_tiled(method: str, height: int, width: int, tile: int = 1001,
+                   perfect: bool = True, seed: int = None, processes: int = None) -> Maze:
+    """
+    Generates a large maze from tiles generated in a pool of worker
+    processes, with a random start and finish
+
+    Parameters
+    ----------
+    method: str
+        The MazeGenMethods value of the generator used for every tile
+    height: int
+        The height of the maze. Must be an odd integer larger than 3
+    width: int
+        The width of the maze. Must be an odd integer larger than 3
+    tile: int, default=1001
+        The height and width of a tile, counting the walls around it. Tiles
+        at the bottom and right edges may be smaller or slightly larger
+    perfect: bool, default=True
+        If True, tiles are joined along a spanning tree so there is exactly
+        one path between any two cells. Otherwise every pair of neighboring
+        tiles is joined, which adds loops between tiles
+    seed: int, optional
+        Seed used for the tiles, the stitching and the start and finish.
+        The same seed and tile size always generate the same maze
+    processes: int, optional
+        The number of worker processes. Defaults to the number of CPUs
+    """
+    if method not in GENERATORS:
+        raise ValueError(f'Invalid method: {method}')
+    if height % 2 == 0 or height <= 3 or width % 2 == 0 or width <= 3:
+        raise ValueError('Maze height and width must be odd integers larger than 3')
+    if tile % 2 == 0 or tile <= 3:
+        raise ValueError('Tile size must be an odd integer larger than 3')
+    rng = random.Random(seed)
+    rows = _tile_bounds((height-1) // 2, (tile-1) // 2)
+    cols = _tile_bounds((width-1) // 2, (tile-1) // 2)
+    tr, tc = len(rows) - 1, len(cols) - 1
+
+    maze = Maze.filled(CellType.WALL, height=height, width=width)
+    grid = maze.grid
+    items = [(i*tc + j, method, 2*(rows[i+1]-rows[i]) + 1, 2*(cols[j+1]-cols[j]) + 1,
+              rng.getrandbits(64)) for i in range(tr) for j in range(tc)]
+    with multiprocessing.Pool(processes) as pool:
+        for k, tile_grid in pool.imap_unordered(_generate_tile, items):
+            i, j = divmod(k, tc)
+            tw = 2*(cols[j+1]-cols[j]) + 1
+            left = 2*cols[j]
+            # Copy every row of the tile but its border walls, which are
+            # already walls of the maze
+            for r in range(1, 2*(rows[i+1]-rows[i])):
+                a = (2*rows[i] + r)*width + left
+                grid[a+1:a+tw-1] = tile_grid[r*tw+1:(r+1)*tw-1]
+
+    # Each edge of the tile grid is a wall between two tiles, opened at a
+    # random cell along it
+    edges = [(i*tc + j, i*tc + j+1) for i in range(tr) for j in range(tc-1)]
+    edges += [(i*tc + j, (i+1)*tc + j) for i in range(tr-1) for j in range(tc)]
+    rng.shuffle(edges)
+    sets = DisjointSet(tr * tc)
+    for a, b in edges:
+        if not sets.union(a, b) and perfect:
+            continue
+        i, j = divmod(a, tc)
+        if b == a + 1:
+            r = rng.randrange(rows[i], rows[i+1])
+            grid[(2*r+1)*width + 2*cols[j+1]] = CellType.PASSAGE.value
+        else:
+            c = rng.randrange(cols[j], cols[j+1])
+            grid[2*rows[i+1]*width + 2*c+1] = CellType.PASSAGE.value
+    maze.invalidate()
+
+    kw = (width-1) // 2
+    s, f = rng.sample(range(((height-1) // 2) * kw), 2)
+    maze.start_pos = Cell(2*(s // kw) + 1, 2*(s % kw) + 1)
+    maze.finish_pos = Cell(2*(f // kw) + 1, 2*(f % kw) + 1)
+    maze.set(maze.start_pos, CellType.START)
+    maze.set(maze.finish_pos, CellType.FINISH)
+    return maze
+
+
+# The solvers raced by solve_portfolio by default, as (method, kwargs) pairs
+PORTFOLIO = [
+    (MazeSolverMethods.DFS, {}),
+    (MazeSolverMethods.BFS, {}),
+    (MazeSolverMethods.ASTAR, {'heuristic': 'euclidian'}),
+    (MazeSolverMethods.ASTAR, {'heuristic': 'manhattan'}),
+    (MazeSolverMethods.BIBFS, {}),
+    (MazeSolverMethods.BIASTAR, {'heuristic': 'manhattan'}),
+    (MazeSolverMethods.JPS, {}),
+]
+
+# Seconds between checks for timeouts and dead workers while waiting
+_POLL = 0.05
+
+PortfolioResult = namedtuple('PortfolioResult', [
+    'method', 'kwargs', 'solution', 'solution_cost', 'nodes_expanded', 'elapsed'])
+PortfolioResult.__doc__ = """
+The winning solver of a portfolio solve and its results. elapsed is the
+wall time in seconds from starting the portfolio to receiving the result
+"""
+
+
+def _run_solver(results, i: int, maze, method: str, kwargs: dict) -> None:
+    if isinstance(maze, SharedMazeHandle):
+        maze = attach(maze)
+    try:
+        s = SOLVERS[method](maze, flat=True, **kwargs)
+    except Exception as e:
+        results.put((i, None, repr(e), 0))
+        return
+    # Send the path as flat ids, which pickle far smaller than Cells
+    path = array(index_typecode(maze.height * maze.width), map(maze.cell_id, s.solution))
+    results.put((i, path, s.solution_cost, s.nodes_expanded))
+
+
+def solve_portfolio(maze: Maze, solvers: List[Tuple[str, dict]] = None,
+                    optimal: bool = True, timeout: float = None) -> PortfolioResult:
+    """
+    Runs several solvers on maze in parallel and returns the result of the
+    first one to finish that meets the requested optimality. The rest are
+    terminated
+
+    Parameters
+    ----------
+    maze: Maze
+        The maze to solve, from its start to its finish
+    solvers: List[Tuple[str, dict]], optional
+        (method, kwargs) pairs of the solvers to run, where kwargs are sent
+        to the solver. Defaults to :data:`PORTFOLIO`
+    optimal: bool, default=True
+        If True, only results of solvers that always find a shortest path
+        are accepted. Otherwise the first solver to finish wins
+    timeout: float, optional
+        Raise a TimeoutError if no result is accepted within this many
+        seconds
+    """
+    if solvers is None:
+        solvers = PORTFOLIO
+    for method, _ in solvers:
+        if method not in SOLVERS:
+            raise ValueError(f'Invalid method: {method}')
+    accepted = [not optimal or SOLVERS[method].optimal for method, _ in solvers]
+    if not any(accepted):
+        raise ValueError('No solver in the portfolio finds optimal solutions')
+
+    start = time.perf_counter()
+    shared = None
+    target = maze
+    if multiprocessing.get_start_method() != 'fork':
+        # Forked workers already share the parent's grid. Otherwise hand
+        # them the grid in shared memory instead of pickling a copy for each
+        shared = SharedMaze(maze)
+        target = shared.handle
+    results = multiprocessing.Queue()
+    workers = [multiprocessing.Process(
+        target=_run_solver, args=(results, i, target, method, kwargs), daemon=True)
+        for i, (method, kwargs) in enumerate(solvers)]
+    for w in workers:
+        w.start()
+    try:
+        pending = sum(accepted)
+        error = None
+        while pending:
+            if timeout is not None and time.perf_counter() - start > timeout:
+                raise TimeoutError('No solver in the portfolio finished in time')
+            try:
+                i, path, cost, nodes = results.get(timeout=_POLL)
+            except queue.Empty:
+                # A worker killed from outside never sends a result
+                if not any(w.is_alive() for w in workers) and results.empty():
+                    raise RuntimeError('Every solver in the portfolio exited without a result')
+                continue
+            if not accepted[i]:
+                continue
+            pending -= 1
+            if path is None:
+                error = cost
+                continue
+            method, kwargs = solvers[i]
+            return PortfolioResult(
+                method, kwargs, [maze.id_to_cell(c) for c in path], cost, nodes,
+                time.perf_counter() - start)
+        raise RuntimeError(f'Every solver in the portfolio failed: {error}')
+    finally:
+        for w in workers:
+            if w.is_alive():
+                w.terminate()
+        for w in workers:
+            w.join()
+        results.close()
+        if shared is not None:
+            shared.close()
@@ -0,0 +1,93 @@
+"""
+This file contains the shared-memory maze handoff for multi-process solving.
+
+SharedMaze copies the grid of a maze once into a block of
+multiprocessing.shared_memory and describes it with a small, picklable
+SharedMazeHandle. Worker processes pass the handle to :func:`attach` to get
+a :class:`Maze` whose grid is a read-only view of the shared block, so no
+grid is pickled or copied no matter how many workers use it. Writing to an
+attached maze raises a TypeError.
+
+The process that created the SharedMaze owns the block and must close it
+when the workers are done, which is easiest with a with statement:
+
+    with SharedMaze(maze) as shared:
+        pool.map(work, [shared.handle] * n)
+
+Workers must be started by the process that created the SharedMaze, for
+example with multiprocessing, so that they share its resource tracker and
+leave freeing the block to the owner.
+"""
+
+import weakref
+from collections import namedtuple
+from multiprocessing.shared_memory import SharedMemory
+
+from pymaze.maze import Maze
+
+SharedMazeHandle = namedtuple('SharedMazeHandle', [
+    'name', 'height', 'width', 'start_pos', 'finish_pos', 'chars'])
+SharedMazeHandle.__doc__ = """
+Everything a worker needs to attach to a shared maze: the name of the
+shared memory block, the size of the maze, its start and finish and the
+characters used to print it
+"""
+
+_CHAR_NAMES = ('wall_char', 'passage_char', 'start_char', 'finish_char')
+
+
+class SharedMaze:
+    """
+    A copy of a maze grid in shared memory, owned by the creating process
+    """
+
+    def __init__(self, maze: Maze) -> None:
+        """
+        Copies the grid of maze into a new shared memory block. Later
+        changes to maze are not seen by the workers
+        """
+        size = maze.height * maze.width
+        # A block cannot be empty
+        self.shm = SharedMemory(create=True, size=max(size, 1))
+        self.shm.buf[:size] = maze.grid
+        self.handle = SharedMazeHandle(
+            self.shm.name, maze.height, maze.width, maze.start_pos, maze.finish_pos,
+            tuple(getattr(maze, name) for name in _CHAR_NAMES))
+
+    def close(self) -> None:
+        """
+        Frees the shared memory block. Workers must not use their attached
+        mazes afterwards
+        """
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+    def __enter__(self) -> 'SharedMaze':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _release(view: memoryview, shm: SharedMemory) -> None:
+    # The view has to be released before the block can be closed
+    view.release()
+    shm.close()
+
+
+def attach(handle: SharedMazeHandle) -> Maze:
+    """
+    Returns a read-only :class:`Maze` backed by the shared memory block of
+    handle, without copying the grid. The block stays mapped in this
+    process for as long as the maze is alive
+    """
+    shm = SharedMemory(name=handle.name)
+    view = shm.buf[:handle.height * handle.width].toreadonly()
+    maze = Maze.from_buffer(
+        view, handle.height, handle.width, **dict(zip(_CHAR_NAMES, handle.chars)))
+    maze.start_pos = handle.start_pos
+    maze.finish_pos = handle.finish_pos
+    weakref.finalize(maze, _release, view, shm)
+    return maze
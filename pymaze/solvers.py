@@ -1,5 +1,14 @@
-from pymaze.maze import Maze, Cell
-from pymaze.utils import PriorityQueue, heuristic
+from typing import List
+from collections import deque
+from itertools import repeat
+
+from pymaze.maze import Maze, Cell, CellType
+from pymaze.graph import JunctionGraph
+from pymaze.utils import (
+    PriorityQueue, FlatSet, FlatMap, StampedMap, SearchBuffers, heuristic)
+
+_WALL = CellType.WALL.value
+INF = float('inf')
 
 
 class MazeSolverMethods:
@@ -7,6 +16,10 @@ class MazeSolverMethods:
     BFS = 'BFS'
     UCS = 'UCS'
     ASTAR = 'ASTAR'
+    BIBFS = 'BIBFS'
+    BIASTAR = 'BIASTAR'
+    JPS = 'JPS'
+    LPASTAR = 'LPASTAR'
 
 class HeuristicMethods:
     EUCLIDIAN = 'Euclidian'
@@ -16,8 +29,30 @@ class HeuristicMethods:
 class MazeSolver:
     """
     Base class for maze solvers
+
+    Solvers search over nodes. By default a node is a :class:`Cell` and the
+    search state is kept in dicts and sets. With flat=True a node is the
+    flat cell id (row*width + col) and the search state is kept in
+    preallocated arrays, which is much faster and smaller on large mazes.
+    Passing a :class:`SearchBuffers` as buffers implies flat=True and takes
+    the arrays from it instead, so searches run one after another over the
+    same maze reuse them. Either way, the solution is a list of :class:`Cell` objects and step()
+    returns the :class:`Cell` objects it touched.
+
+    The search runs from the maze's start_pos to its finish_pos unless other
+    cells are passed as start and finish.
+
+    Solvers that support weighted edges can also search a
+    :class:`JunctionGraph` of the maze passed as graph. Nodes are then the
+    graph's node numbers and the solution is expanded back along the
+    contracted corridors.
     """
 
+    # Whether the solver can search a weighted JunctionGraph
+    supports_graph = False
+    # Whether the solution is always a shortest path
+    optimal = True
+
     def __init__(self, maze: Maze, **kwargs) -> None:
         self.maze: Maze = maze
         self.solution = []
@@ -25,25 +60,155 @@ class MazeSolver:
         self.nodes_expanded = 0
         self.frontier = None
         self.explored = None
-        self.parent = {}
 
         self.step_mode = kwargs.pop('step', False)
+        self.buffers: SearchBuffers = kwargs.pop('buffers', None)
+        self.flat = kwargs.pop('flat', False) or self.buffers is not None
+        self.graph: JunctionGraph = kwargs.pop('graph', None)
+        if self.graph is not None and not self.supports_graph:
+            raise ValueError(
+                f'{type(self).__name__} cannot search a junction graph')
         self.finished = False
 
+        self.parent = self.new_map()
+        self.start_pos = kwargs.pop('start', self.maze.start_pos)
+        self.finish_pos = kwargs.pop('finish', self.maze.finish_pos)
+        self.start = self.node(self.start_pos)
+        self.finish = self.node(self.finish_pos)
+
+    def node(self, c: Cell):
+        """
+        Returns the search node of cell c
+        """
+        if c is None:
+            return None
+        if self.graph is not None:
+            return self.graph.node(c)
+        if self.flat:
+            return c.row * self.maze.width + c.col
+        return c
+
+    def cell(self, n) -> Cell:
+        """
+        Returns the :class:`Cell` of search node n
+        """
+        if self.graph is not None:
+            return self.graph.cell(n)
+        if self.flat:
+            return Cell(*divmod(n, self.maze.width))
+        return n
+
+    @property
+    def size(self) -> int:
+        """
+        The number of nodes in the search space
+        """
+        if self.graph is not None:
+            return self.graph.size
+        return self.maze.height * self.maze.width
+
+    def new_set(self):
+        """
+        Returns an empty set of search nodes
+        """
+        if self.buffers is not None:
+            return self.buffers.new_set()
+        if self.flat:
+            return FlatSet(self.size)
+        return set()
+
+    def new_map(self):
+        """
+        Returns an empty mapping of search nodes to non-negative integers
+        """
+        if self.buffers is not None:
+            return self.buffers.new_map()
+        if self.flat:
+            return FlatMap(self.size)
+        return {}
+
+    def touched(self, nodes: list) -> List[Cell]:
+        """
+        Converts the nodes returned by step() to :class:`Cell` objects.
+        Conversion is skipped when not in step mode since nobody reads them
+        """
+        if (self.flat or self.graph is not None) and self.step_mode:
+            return [self.cell(n) for n in nodes]
+        return nodes
+
+    def neighbors(self, p):
+        """
+        Returns the passages adjacent to node p, using the maze's adjacency
+        index when it has been built
+        """
+        if self.graph is not None:
+            return self.graph.neighbors(p)
+        adjacency = self.maze.adjacency
+        if adjacency is None:
+            return self.grid_neighbors(p)
+        offsets, neighbors = adjacency
+        if self.flat:
+            return neighbors[offsets[p]:offsets[p+1]]
+        w = self.maze.width
+        i = p.row * w + p.col
+        return [Cell(*divmod(n, w)) for n in neighbors[offsets[i]:offsets[i+1]]]
+
+    def grid_neighbors(self, p):
+        """
+        Returns the passages adjacent to node p, read from the grid. Unlike
+        the adjacency index this also works when p is a wall
+        """
+        if not self.flat:
+            return self.maze.get_neighboring_passages(p)
+        grid = self.maze.grid
+        w = self.maze.width
+        row, col = divmod(p, w)
+        res = []
+        if row + 1 < self.maze.height and grid[p+w] != _WALL:
+            res.append(p+w)
+        if row > 0 and grid[p-w] != _WALL:
+            res.append(p-w)
+        if col + 1 < w and grid[p+1] != _WALL:
+            res.append(p+1)
+        if col > 0 and grid[p-1] != _WALL:
+            res.append(p-1)
+        return res
+
+    def edges(self, p):
+        """
+        Returns (neighbor, cost) pairs for the moves out of node p
+        """
+        if self.graph is not None:
+            return self.graph.edges(p)
+        return zip(self.neighbors(p), repeat(1))
+
+    def path_cells(self, u, v) -> List[Cell]:
+        """
+        Returns the cells walked when moving from node u to the adjacent
+        node v, excluding u and including v
+        """
+        if self.graph is None or u is None:
+            return [self.cell(v)]
+        return [self.maze.id_to_cell(i) for i in self.graph.corridor(u, v)]
+
     def backtrack_solution(self):
-        p = self.maze.finish_pos
-        while p and p != self.maze.start_pos:
-            self.solution.append(p)
-            p = self.parent.get(p, None)
+        p = self.finish
+        while p is not None and p != self.start:
+            q = self.parent.get(p, None)
+            self.solution.extend(reversed(self.path_cells(q, p)))
+            p = q
         self.solution.reverse()
 
 
 class DFSMazeSolver(MazeSolver):
+    supports_graph = True
+    optimal = False
+
     def __init__(self, maze, **kwargs) -> None:
         super().__init__(maze, **kwargs)
-        self.frontier = [self.maze.start_pos]
-        self.explored = set()
-        self.explored.add(self.maze.start_pos)
+        self.frontier = [self.start]
+        self.explored = self.new_set()
+        self.explored.add(self.start)
         self.nodes_expanded += 1
 
         if self.step_mode:
@@ -58,28 +223,28 @@ class DFSMazeSolver(MazeSolver):
             self.finished = True
             return None
         p = self.frontier.pop()
-        if p == self.maze.finish_pos:
+        if p == self.finish:
             self.backtrack_solution()
             self.solution_cost = len(self.solution)
             self.finished = True
             return None
         res = []
-        for neighbor in self.maze.get_neighboring_passages(p):
+        for neighbor in self.neighbors(p):
             if not neighbor in self.explored:
                 self.explored.add(neighbor)
                 self.parent[neighbor] = p
                 self.frontier.append(neighbor)
                 self.nodes_expanded += 1
                 res.append(neighbor)
-        return res  # Return nodes we just added to frontier
+        return self.touched(res)  # Return nodes we just added to frontier
 
 
 class BFSMazeSolver(MazeSolver):
     def __init__(self, maze: Maze, **kwargs) -> None:
         super().__init__(maze, **kwargs)
-        self.frontier = []
-        self.explored = set()
-        self.frontier.append(self.maze.start_pos)
+        self.frontier = deque()
+        self.explored = self.new_set()
+        self.frontier.append(self.start)
 
         if self.step_mode:
             return
@@ -93,34 +258,39 @@ class BFSMazeSolver(MazeSolver):
         if not self.frontier:
             self.finished = True
             return None
-        p = self.frontier.pop(0)
+        p = self.frontier.popleft()
         self.explored.add(p)
         res = []
-        for neighbor in self.maze.get_neighboring_passages(p):
+        for neighbor in self.neighbors(p):
             if not neighbor in self.explored:
                 res.append(neighbor)
                 self.nodes_expanded += 1
                 self.explored.add(neighbor)
                 self.parent[neighbor] = p
-                if neighbor == self.maze.finish_pos:
+                if neighbor == self.finish:
                     self.finished = True
                     self.backtrack_solution()
                     self.solution_cost = len(self.solution)
-                    return res
+                    return self.touched(res)
                 self.frontier.append(neighbor)
-        return res
+        return self.touched(res)
 
 
 class UCSMazeSolver(MazeSolver):
+    supports_graph = True
+
     def __init__(self, maze: Maze, **kwargs) -> None:
         super().__init__(maze, **kwargs)
         self.frontier = PriorityQueue()
-        self.frontier.add(maze.start_pos, 0)
-        self.costs = {self.maze.start_pos: 0}
+        self.frontier.add(self.start, 0)
+        self.costs = self.new_map()
+        self.costs[self.start] = 0
         self.nodes_expanded = 1
 
         if self.step_mode:
             return
+        while not self.finished:
+            self.step()
 
     def step(self):
         if self.finished:
@@ -129,30 +299,33 @@ class UCSMazeSolver(MazeSolver):
             self.finished = True
             return None
         cost, p = self.frontier.pop()
-        if p == self.maze.finish_pos:
+        if p == self.finish:
             self.backtrack_solution()
             self.solution_cost = len(self.solution)
             self.finished = True
             return None
         res = []
-        for neighbor in self.maze.get_neighboring_passages(p):
-            new_cost = cost+1
+        for neighbor, weight in self.edges(p):
+            new_cost = cost+weight
             if not neighbor in self.costs or new_cost < self.costs.get(neighbor, new_cost):
                 self.costs[neighbor] = new_cost
                 self.frontier.add(neighbor, new_cost)
                 self.parent[neighbor] = p
                 self.nodes_expanded += 1
                 res.append(neighbor)
-        return res
+        return self.touched(res)
 
 
 class ASTARMazeSolver(MazeSolver):
+    supports_graph = True
+
     def __init__(self, maze: Maze, **kwargs) -> None:
         super().__init__(maze, **kwargs)
         self.heuristic = kwargs.pop('heuristic', 'euclidian')
         self.frontier = PriorityQueue()
-        self.frontier.add(self.maze.start_pos, 0)
-        self.costs = {self.maze.start_pos: 0}
+        self.frontier.add(self.start, 0)
+        self.costs = self.new_map()
+        self.costs[self.start] = 0
         self.nodes_expanded = 1
 
         if self.step_mode:
@@ -167,19 +340,521 @@ class ASTARMazeSolver(MazeSolver):
             self.finished = True
             return None
         _, p = self.frontier.pop()
-        if p == self.maze.finish_pos:
+        if p == self.finish:
             self.backtrack_solution()
             self.solution_cost = len(self.solution)
             self.finished = True
             return None
         res = []
-        for neighbor in self.maze.get_neighboring_passages(p):
-            new_cost = self.costs[p] + 1
+        for neighbor, weight in self.edges(p):
+            new_cost = self.costs[p] + weight
             if not neighbor in self.costs or new_cost < self.costs.get(neighbor, new_cost):
                 self.nodes_expanded += 1
                 self.costs[neighbor] = new_cost
                 self.frontier.add(
-                    neighbor, new_cost+heuristic(neighbor, self.maze.finish_pos, self.heuristic))
+                    neighbor, new_cost+heuristic(self.cell(neighbor), self.finish_pos, self.heuristic))
                 self.parent[neighbor] = p
                 res.append(neighbor)
-        return res
\ No newline at end of file
+        return self.touched(res)
+
+class BidirectionalMazeSolver(MazeSolver):
+    """
+    Base class for solvers that search from the start and the finish at the
+    same time. The backward search keeps its own costs and a child mapping
+    pointing from each node towards the finish.
+
+    THIS CLASS DOES NOT PERFORM A SEARCH. Subclasses implement step()
+    """
+
+    def __init__(self, maze: Maze, **kwargs) -> None:
+        super().__init__(maze, **kwargs)
+        self.frontier_back = None
+        self.costs = self.new_map()
+        self.costs_back = self.new_map()
+        self.child = self.new_map()
+        # Best path found so far goes through meeting and has cost best
+        self.meeting = None
+        self.best = None
+
+        if self.start is None or self.finish is None:
+            self.finished = True
+        elif self.start == self.finish:
+            self.finished = True
+        else:
+            self.costs[self.start] = 0
+            self.costs_back[self.finish] = 0
+            self.nodes_expanded = 2
+
+    def meet(self, n, costs, other_costs) -> None:
+        """
+        Records node n as a meeting point if the path through it is the
+        best found so far. costs is the search n was just reached from
+        """
+        if n in other_costs:
+            total = costs[n] + other_costs[n]
+            if self.best is None or total < self.best:
+                self.best = total
+                self.meeting = n
+
+    def join_solution(self) -> None:
+        """
+        Builds the solution from the forward path to the meeting node and
+        the backward path from it
+        """
+        self.finished = True
+        if self.meeting is None:
+            return
+        p = self.meeting
+        while p is not None and p != self.start:
+            q = self.parent.get(p, None)
+            self.solution.extend(reversed(self.path_cells(q, p)))
+            p = q
+        self.solution.reverse()
+        p = self.meeting
+        c = self.child.get(p, None)
+        while c is not None:
+            self.solution.extend(self.path_cells(p, c))
+            p = c
+            c = self.child.get(p, None)
+        self.solution_cost = len(self.solution)
+
+
+class BiBFSMazeSolver(BidirectionalMazeSolver):
+    """
+    Bidirectional Breadth-First Search
+
+    Each step expands one node. The side with the smaller queue is searched
+    one full layer at a time, and the search stops at the end of the first
+    layer in which the two searches meet, which guarantees a shortest path.
+    """
+
+    def __init__(self, maze: Maze, **kwargs) -> None:
+        super().__init__(maze, **kwargs)
+        self.frontier = deque([self.start])
+        self.frontier_back = deque([self.finish])
+        self.forward = True
+        self.layer_left = 1
+
+        if self.step_mode:
+            return
+        while not self.finished:
+            self.step()
+
+    def step(self):
+        if self.finished:
+            return None
+        if not self.frontier or not self.frontier_back:
+            self.join_solution()
+            return None
+        if self.forward:
+            queue, costs, other_costs, parent = (
+                self.frontier, self.costs, self.costs_back, self.parent)
+        else:
+            queue, costs, other_costs, parent = (
+                self.frontier_back, self.costs_back, self.costs, self.child)
+        p = queue.popleft()
+        res = []
+        for neighbor in self.neighbors(p):
+            if not neighbor in costs:
+                costs[neighbor] = costs[p] + 1
+                parent[neighbor] = p
+                queue.append(neighbor)
+                self.nodes_expanded += 1
+                res.append(neighbor)
+                self.meet(neighbor, costs, other_costs)
+        self.layer_left -= 1
+        if self.layer_left == 0:
+            if self.best is not None:
+                self.join_solution()
+                return self.touched(res)
+            self.forward = len(self.frontier) <= len(self.frontier_back)
+            self.layer_left = len(
+                self.frontier if self.forward else self.frontier_back)
+        return self.touched(res)
+
+
+class BiASTARMazeSolver(BidirectionalMazeSolver):
+    """
+    Bidirectional A* Search
+
+    Both searches use the average of the forward and backward heuristics as
+    potential: p(n) = (h(n, finish) - h(n, start)) / 2. The forward search
+    is keyed by cost + p(n) and the backward search by cost - p(n). Each step
+    expands one node from the side with the smaller frontier, and the search
+    stops once the smallest keys on the two frontiers add up to at least the
+    cost of the best meeting point found.
+    """
+
+    supports_graph = True
+
+    def __init__(self, maze: Maze, **kwargs) -> None:
+        super().__init__(maze, **kwargs)
+        self.heuristic = kwargs.pop('heuristic', 'euclidian')
+        self.frontier = PriorityQueue()
+        self.frontier_back = PriorityQueue()
+        self.explored = self.new_set()
+        self.explored_back = self.new_set()
+        if not self.finished:
+            self.frontier.add(self.start, self.potential(self.start))
+            self.frontier_back.add(self.finish, -self.potential(self.finish))
+
+        if self.step_mode:
+            return
+        while not self.finished:
+            self.step()
+
+    def potential(self, n) -> float:
+        c = self.cell(n)
+        return (heuristic(c, self.finish_pos, self.heuristic)
+                - heuristic(c, self.start_pos, self.heuristic)) / 2
+
+    def step(self):
+        if self.finished:
+            return None
+        if self.frontier.is_empty or self.frontier_back.is_empty:
+            self.join_solution()
+            return None
+        if self.best is not None and self.best <= (
+                self.frontier.queue[0][0] + self.frontier_back.queue[0][0]):
+            self.join_solution()
+            return None
+        if len(self.frontier.queue) <= len(self.frontier_back.queue):
+            queue, explored, costs, other_costs, parent, sign = (
+                self.frontier, self.explored, self.costs, self.costs_back,
+                self.parent, 1)
+        else:
+            queue, explored, costs, other_costs, parent, sign = (
+                self.frontier_back, self.explored_back, self.costs_back,
+                self.costs, self.child, -1)
+        _, p = queue.pop()
+        if p in explored:
+            return []
+        explored.add(p)
+        res = []
+        for neighbor, weight in self.edges(p):
+            new_cost = costs[p] + weight
+            if not neighbor in costs or new_cost < costs[neighbor]:
+                self.nodes_expanded += 1
+                costs[neighbor] = new_cost
+                queue.add(neighbor, new_cost + sign*self.potential(neighbor))
+                parent[neighbor] = p
+                res.append(neighbor)
+                self.meet(neighbor, costs, other_costs)
+        return self.touched(res)
+
+
+class JPSMazeSolver(MazeSolver):
+    """
+    4-connected Jump Point Search
+
+    A* over jump points. Instead of pushing every neighbor, the search
+    scans in straight lines and only stops at the finish, at cells with a
+    forced neighbor, or, when moving vertically, at cells from which a
+    horizontal scan finds a jump point. This prunes the many symmetric
+    equal-cost paths through open areas of a maze. Scattered walls each
+    add jump points, so on such maps far fewer nodes are pruned and the
+    scans can make JPS slower than A*. The solution is expanded back into
+    every cell between consecutive jump points.
+
+    A horizontal scan finds the same jump point from every cell it passes,
+    so its result is stored for each of those cells and each direction.
+    Every cell is then scanned horizontally at most once per direction in a
+    search, which keeps the many horizontal scans started by vertical scans
+    from costing O(height*width) per expansion.
+    """
+
+    def __init__(self, maze: Maze, **kwargs) -> None:
+        super().__init__(maze, **kwargs)
+        self.heuristic = kwargs.pop('heuristic', 'manhattan')
+        self.frontier = PriorityQueue()
+        self.explored = self.new_set()
+        self.costs = self.new_map()
+        # Column of the jump point found by a horizontal scan from each flat
+        # cell id, scanning left and right, or -1 when the scan found none.
+        # The scan reads the arrays of the maps directly, so they are
+        # StampedMaps even when the solver is not flat
+        size = self.maze.height * self.maze.width
+        self.row_jumps = {d: self.buffers.new_map() if self.buffers is not None
+                          else StampedMap(size) for d in (-1, 1)}
+        if self.start is None or self.finish is None:
+            self.finished = True
+        else:
+            self.frontier.add(self.start, 0)
+            self.costs[self.start] = 0
+            self.nodes_expanded = 1
+
+        if self.step_mode:
+            return
+        while not self.finished:
+            self.step()
+
+    def walkable(self, row: int, col: int) -> bool:
+        return (0 <= row < self.maze.height and 0 <= col < self.maze.width
+                and self.maze.grid[row*self.maze.width + col] != _WALL)
+
+    def jump(self, row: int, col: int, dr: int, dc: int):
+        """
+        Scans from (row, col) in direction (dr, dc) and returns the
+        coordinates of the first jump point found, or None
+        """
+        if dc:
+            return self.jump_row(row, col, dc)
+        walkable, jump_row = self.walkable, self.jump_row
+        goal = self.finish_pos
+        while walkable(row, col):
+            if row == goal.row and col == goal.col:
+                return row, col
+            if ((walkable(row, col-1) and not walkable(row-dr, col-1))
+                    or (walkable(row, col+1) and not walkable(row-dr, col+1))):
+                return row, col
+            if jump_row(row, col+1, 1) or jump_row(row, col-1, -1):
+                return row, col
+            row += dr
+        return None
+
+    def jump_row(self, row: int, col: int, dc: int):
+        """
+        Scans from (row, col) horizontally in direction dc and returns the
+        coordinates of the first jump point found, or None. The result is
+        stored for every cell passed
+        """
+        h, w = self.maze.height, self.maze.width
+        if not 0 <= row < h:
+            return None
+        grid = self.maze.grid
+        memo = self.row_jumps[dc]
+        data, stamps, stamp = memo.data, memo.stamps, memo.stamp
+        goal = self.finish_pos.row*w + self.finish_pos.col
+        base = row*w
+        up, down = row > 0, row < h-1
+        passed = []
+        found = -1
+        while 0 <= col < w:
+            i = base + col
+            if grid[i] == _WALL:
+                break
+            if stamps[i] == stamp:
+                found = data[i]
+                break
+            passed.append(i)
+            # A forced neighbor is open above or below a cell whose
+            # neighbor behind it in that row is a wall or off the grid
+            back = 0 <= col - dc < w
+            if (i == goal
+                    or (up and grid[i-w] != _WALL and not (back and grid[i-w-dc] != _WALL))
+                    or (down and grid[i+w] != _WALL and not (back and grid[i+w-dc] != _WALL))):
+                found = col
+                break
+            col += dc
+        for i in passed:
+            data[i] = found
+            stamps[i] = stamp
+        return None if found == -1 else (row, found)
+
+    def directions(self, p: Cell) -> List[tuple]:
+        """
+        Returns the directions to scan from jump point p given the direction
+        it was reached from
+        """
+        parent = self.parent.get(self.node(p), None)
+        if parent is None:
+            return [(1, 0), (-1, 0), (0, 1), (0, -1)]
+        q = self.cell(parent)
+        dr = (p.row > q.row) - (p.row < q.row)
+        dc = (p.col > q.col) - (p.col < q.col)
+        if dc:
+            return [(-1, 0), (1, 0), (0, dc)]
+        return [(0, -1), (0, 1), (dr, 0)]
+
+    def step(self):
+        if self.finished:
+            return None
+        if self.frontier.is_empty:
+            self.finished = True
+            return None
+        _, p = self.frontier.pop()
+        if p in self.explored:
+            return []
+        self.explored.add(p)
+        if p == self.finish:
+            self.backtrack_solution()
+            self.solution_cost = len(self.solution)
+            self.finished = True
+            return None
+        c = self.cell(p)
+        res = []
+        for dr, dc in self.directions(c):
+            jp = self.jump(c.row+dr, c.col+dc, dr, dc)
+            if jp is None:
+                continue
+            neighbor = self.node(Cell(*jp))
+            new_cost = self.costs[p] + abs(jp[0]-c.row) + abs(jp[1]-c.col)
+            if not neighbor in self.costs or new_cost < self.costs[neighbor]:
+                self.nodes_expanded += 1
+                self.costs[neighbor] = new_cost
+                self.frontier.add(neighbor, new_cost+heuristic(
+                    Cell(*jp), self.finish_pos, self.heuristic))
+                self.parent[neighbor] = p
+                res.append(neighbor)
+        return self.touched(res)
+
+    def backtrack_solution(self):
+        p = self.cell(self.finish)
+        while p != self.start_pos:
+            q = self.cell(self.parent[self.node(p)])
+            dr = (q.row > p.row) - (q.row < p.row)
+            dc = (q.col > p.col) - (q.col < p.col)
+            while p != q:
+                self.solution.append(p)
+                p = Cell(p.row+dr, p.col+dc)
+        self.solution.reverse()
+
+
+class LPASTARMazeSolver(MazeSolver):
+    """
+    Lifelong Planning A* Search
+
+    The solver listens to :method:`Maze.set` and keeps its search state
+    when cells flip between wall and passage. Each change only marks the
+    changed cell and its neighbors for repair, and the next steps update
+    just the part of the shortest path tree that the change affects. Call
+    replan() to bring the solution up to date after editing the maze, and
+    detach() once the solver is no longer needed.
+
+    g holds the cost of each node as of its last expansion and rhs the cost
+    its neighbors currently support. Missing entries are infinite. A node
+    is queued while the two differ.
+    """
+
+    def __init__(self, maze: Maze, **kwargs) -> None:
+        super().__init__(maze, **kwargs)
+        self.heuristic = kwargs.pop('heuristic', 'manhattan')
+        self.frontier = PriorityQueue()
+        self.queued = {}
+        self.g = self.new_map()
+        self.rhs = self.new_map()
+        self.changed = []
+        self.maze.add_listener(self.on_change)
+
+        if self.start is None or self.finish is None:
+            self.finished = True
+        else:
+            self.update_vertex(self.start)
+
+        if self.step_mode:
+            return
+        self.replan()
+
+    def on_change(self, c: Cell) -> None:
+        """
+        Listener for :method:`Maze.set`
+        """
+        if self.start is None or self.finish is None:
+            return
+        self.changed.append(self.node(c))
+        self.finished = False
+
+    def detach(self) -> None:
+        """
+        Stops listening to changes of the maze
+        """
+        self.maze.remove_listener(self.on_change)
+
+    def replan(self) -> None:
+        """
+        Runs the search until the solution is up to date with the maze
+        """
+        while not self.finished:
+            self.step()
+
+    def neighbors(self, p):
+        # The adjacency index has no entries for walls, but walls that used
+        # to be passages still have to pass their changes on
+        return self.grid_neighbors(p)
+
+    def key(self, n) -> tuple:
+        cost = min(self.g.get(n, INF), self.rhs.get(n, INF))
+        return (cost + heuristic(self.cell(n), self.finish_pos, self.heuristic), cost)
+
+    def update_vertex(self, n) -> None:
+        if self.maze.is_wall(self.cell(n)):
+            rhs = INF
+        elif n == self.start:
+            rhs = 0
+        else:
+            rhs = min((self.g.get(p, INF) for p in self.neighbors(n)), default=INF) + 1
+        if rhs == INF:
+            self.rhs.pop(n, None)
+        else:
+            self.rhs[n] = rhs
+        self.queued.pop(n, None)
+        if self.g.get(n, INF) != rhs:
+            key = self.key(n)
+            self.queued[n] = key
+            self.frontier.add(n, key)
+
+    def top_key(self) -> tuple:
+        while not self.frontier.is_empty:
+            key, n = self.frontier.queue[0]
+            if self.queued.get(n) == key:
+                return key
+            self.frontier.pop()
+        return (INF, INF)
+
+    def step(self):
+        if self.finished:
+            return None
+        res = []
+        if self.changed:
+            for n in self.changed:
+                self.update_vertex(n)
+                res.append(n)
+                for p in self.neighbors(n):
+                    self.update_vertex(p)
+            self.changed = []
+            return self.touched(res)
+
+        goal_g = self.g.get(self.finish, INF)
+        if self.top_key() >= self.key(self.finish) and self.rhs.get(self.finish, INF) == goal_g:
+            self.finished = True
+            self.solution = []
+            self.solution_cost = 0
+            if goal_g != INF:
+                self.backtrack_solution()
+                self.solution_cost = len(self.solution)
+            return None
+
+        _, n = self.frontier.pop()
+        del self.queued[n]
+        self.nodes_expanded += 1
+        res.append(n)
+        rhs = self.rhs.get(n, INF)
+        if self.g.get(n, INF) > rhs:
+            self.g[n] = rhs
+        else:
+            self.g.pop(n, None)
+            self.update_vertex(n)
+        for p in self.neighbors(n):
+            self.update_vertex(p)
+        return self.touched(res)
+
+    def backtrack_solution(self):
+        p = self.finish
+        while p != self.start:
+            self.solution.append(self.cell(p))
+            cost = self.g[p]
+            p = next(q for q in self.neighbors(p) if self.g.get(q, INF) == cost - 1)
+        self.solution.reverse()
+
+
+# Maps each MazeSolverMethods value to the class implementing it
+SOLVERS = {
+    MazeSolverMethods.DFS: DFSMazeSolver,
+    MazeSolverMethods.BFS: BFSMazeSolver,
+    MazeSolverMethods.UCS: UCSMazeSolver,
+    MazeSolverMethods.ASTAR: ASTARMazeSolver,
+    MazeSolverMethods.BIBFS: BiBFSMazeSolver,
+    MazeSolverMethods.BIASTAR: BiASTARMazeSolver,
+    MazeSolverMethods.JPS: JPSMazeSolver,
+    MazeSolverMethods.LPASTAR: LPASTARMazeSolver,
+}
@@ -0,0 +1,156 @@
+"""
+This file contains a distance oracle for perfect mazes.
+
+A perfect maze, like the ones generated by RDFSMazeGenerator or
+RPAMazeGenerator without loops, has exactly one path between any two
+passages, so its passages form a tree. TreeDistanceOracle roots that tree
+once with a BFS and builds a heavy-light decomposition of it. Afterwards the
+distance between any two passages is found with a lowest common ancestor
+query in O(log n) and the path is read straight off the tree, without
+running a search.
+"""
+
+from array import array
+from collections import deque
+from typing import List
+
+from pymaze.maze import Maze, Cell, CellType
+from pymaze.utils import index_typecode
+
+# Cells counted at a time when the grid has no count method
+_COUNT_BLOCK = 1 << 16
+
+
+class TreeDistanceOracle:
+    """
+    Path length and path queries between passages of a perfect maze
+
+    All arrays are indexed by flat cell id and hold -1 for walls. head holds
+    the top of the heavy path each cell belongs to, which lets a lowest
+    common ancestor query jump a whole heavy path at a time.
+    """
+
+    def __init__(self, maze: Maze, root: Cell = None) -> None:
+        """
+        Build the oracle. Raises a ValueError if the maze is not perfect
+
+        Parameters
+        ----------
+        maze: Maze
+            The maze to index. The oracle is a snapshot and must be rebuilt
+            if the maze changes
+        root: Cell, optional
+            The root of the tree. Defaults to the start of the maze, or the
+            first passage if the maze has no start
+        """
+        self.maze = maze
+        offsets, neighbors = maze.build_adjacency()
+        grid = maze.grid
+        size = maze.height * maze.width
+        wall = CellType.WALL.value
+        if hasattr(grid, 'count'):
+            walls = grid.count(wall)
+        else:
+            # A read-only memoryview from pymaze.shared has no count(). Count
+            # a block at a time so the grid is never copied whole
+            walls = sum(bytes(grid[i:i+_COUNT_BLOCK]).count(wall)
+                        for i in range(0, size, _COUNT_BLOCK))
+        passages = size - walls
+        if passages == 0:
+            raise ValueError('Maze has no passages')
+        if len(neighbors) // 2 != passages - 1:
+            raise ValueError('Maze is not a perfect maze')
+
+        if root is None:
+            root = maze.start_pos
+        if root is None:
+            r = next(i for i in range(size) if grid[i] != CellType.WALL.value)
+        else:
+            if not maze.is_passage(root):
+                raise ValueError(f'Root {root} is not a passage')
+            r = maze.cell_id(root)
+
+        typecode = index_typecode(size)
+        self.parent = array(typecode, [-1]) * size
+        self.depth = array(typecode, [-1]) * size
+        self.head = array(typecode, [-1]) * size
+
+        # Root the tree with a BFS
+        order = array(typecode, [r])
+        self.depth[r] = 0
+        queue = deque([r])
+        while queue:
+            p = queue.popleft()
+            for n in neighbors[offsets[p]:offsets[p+1]]:
+                if self.depth[n] == -1:
+                    self.depth[n] = self.depth[p] + 1
+                    self.parent[n] = p
+                    order.append(n)
+                    queue.append(n)
+        if len(order) != passages:
+            raise ValueError('Maze is not a perfect maze')
+
+        # Find the heavy child (the one with the largest subtree) of each cell
+        subtree = array(typecode, [0]) * size
+        heavy = array(typecode, [-1]) * size
+        for v in reversed(order):
+            subtree[v] += 1
+            p = self.parent[v]
+            if p != -1:
+                subtree[p] += subtree[v]
+                if heavy[p] == -1 or subtree[v] > subtree[heavy[p]]:
+                    heavy[p] = v
+
+        # Each cell continues its parent's heavy path or starts a new one
+        self.head[r] = r
+        for v in order:
+            p = self.parent[v]
+            if p != -1:
+                self.head[v] = self.head[p] if heavy[p] == v else v
+        self.root = maze.id_to_cell(r)
+
+    def _id(self, c: Cell) -> int:
+        i = self.maze.cell_id(c)
+        if not self.maze.is_valid_cell(c) or self.depth[i] == -1:
+            raise ValueError(f'{c} is not a passage')
+        return i
+
+    def _lca(self, u: int, v: int) -> int:
+        head, depth, parent = self.head, self.depth, self.parent
+        while head[u] != head[v]:
+            if depth[head[u]] > depth[head[v]]:
+                u = parent[head[u]]
+            else:
+                v = parent[head[v]]
+        return u if depth[u] < depth[v] else v
+
+    def lca(self, c1: Cell, c2: Cell) -> Cell:
+        """
+        Returns the lowest common ancestor of c1 and c2 in the rooted tree
+        """
+        return self.maze.id_to_cell(self._lca(self._id(c1), self._id(c2)))
+
+    def distance(self, c1: Cell, c2: Cell) -> int:
+        """
+        Returns the length of the path between passages c1 and c2
+        """
+        u, v = self._id(c1), self._id(c2)
+        return self.depth[u] + self.depth[v] - 2*self.depth[self._lca(u, v)]
+
+    def path(self, c1: Cell, c2: Cell) -> List[Cell]:
+        """
+        Returns the path from c1 to c2, excluding c1 and including c2, in
+        the same form as a solver's solution
+        """
+        u, v = self._id(c1), self._id(c2)
+        a = self._lca(u, v)
+        up = []
+        while u != a:
+            u = self.parent[u]
+            up.append(u)
+        down = []
+        while v != a:
+            down.append(v)
+            v = self.parent[v]
+        down.reverse()
+        return [self.maze.id_to_cell(i) for i in up + down]
@@ -1,6 +1,8 @@
 import heapq
 import pdb
 import math
+import random
+from array import array
 from collections import namedtuple
 
 
@@ -19,6 +21,187 @@ class PriorityQueue:
         return not self.queue
 
 
+class DisjointSet:
+    """
+    Disjoint sets of the integers in range(size) backed by arrays, with
+    path compression and union by rank
+    """
+
+    def __init__(self, size: int) -> None:
+        self.parent = array(index_typecode(size), range(size))
+        self.rank = bytearray(size)
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        while parent[x] != x:
+            # Path halving: point every other node at its grandparent
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, x: int, y: int) -> bool:
+        """
+        Merges the sets of x and y. Returns False if they were already
+        the same set
+        """
+        x, y = self.find(x), self.find(y)
+        if x == y:
+            return False
+        rank = self.rank
+        if rank[x] < rank[y]:
+            x, y = y, x
+        self.parent[y] = x
+        if rank[x] == rank[y]:
+            rank[x] += 1
+        return True
+
+
+def index_typecode(size: int) -> str:
+    """
+    Returns the smallest signed array typecode that can index size items
+    """
+    return 'i' if size < 2**31 else 'q'
+
+
+class FlatSet:
+    """
+    Set of flat cell ids in range(size) backed by a preallocated bytearray
+    """
+
+    def __init__(self, size: int) -> None:
+        self.data = bytearray(size)
+
+    def add(self, item: int) -> None:
+        self.data[item] = 1
+
+    def __contains__(self, item: int) -> bool:
+        return self.data[item] == 1
+
+
+class FlatMap:
+    """
+    Mapping of flat cell ids in range(size) to non-negative integers backed
+    by a preallocated array. Missing keys are stored as -1
+    """
+
+    def __init__(self, size: int) -> None:
+        self.data = array(index_typecode(size), [-1]) * size
+
+    def get(self, key: int, default=None):
+        val = self.data[key]
+        return default if val == -1 else val
+
+    def pop(self, key: int, default=None):
+        val = self.data[key]
+        self.data[key] = -1
+        return default if val == -1 else val
+
+    def __getitem__(self, key: int) -> int:
+        val = self.data[key]
+        if val == -1:
+            raise KeyError(key)
+        return val
+
+    def __setitem__(self, key: int, val: int) -> None:
+        self.data[key] = val
+
+    def __contains__(self, key: int) -> bool:
+        return self.data[key] != -1
+
+
+class StampedSet:
+    """
+    Set of flat cell ids in range(size) that can be emptied in constant
+    time. Every item added is stamped with the current stamp, and clear()
+    moves on to a new stamp instead of touching the items
+    """
+
+    def __init__(self, size: int) -> None:
+        self.stamps = array('q', [0]) * size
+        self.stamp = 1
+
+    def clear(self) -> None:
+        self.stamp += 1
+
+    def add(self, item: int) -> None:
+        self.stamps[item] = self.stamp
+
+    def __contains__(self, item: int) -> bool:
+        return self.stamps[item] == self.stamp
+
+
+class StampedMap:
+    """
+    Mapping of flat cell ids in range(size) to integers that can be emptied
+    in constant time, like :class:`StampedSet`
+    """
+
+    def __init__(self, size: int) -> None:
+        self.data = array(index_typecode(size), [0]) * size
+        self.stamps = array('q', [0]) * size
+        self.stamp = 1
+
+    def clear(self) -> None:
+        self.stamp += 1
+
+    def get(self, key: int, default=None):
+        return self.data[key] if self.stamps[key] == self.stamp else default
+
+    def pop(self, key: int, default=None):
+        if self.stamps[key] != self.stamp:
+            return default
+        self.stamps[key] = 0
+        return self.data[key]
+
+    def __getitem__(self, key: int) -> int:
+        if self.stamps[key] != self.stamp:
+            raise KeyError(key)
+        return self.data[key]
+
+    def __setitem__(self, key: int, val: int) -> None:
+        self.data[key] = val
+        self.stamps[key] = self.stamp
+
+    def __contains__(self, key: int) -> bool:
+        return self.stamps[key] == self.stamp
+
+
+class SearchBuffers:
+    """
+    Sets and maps of flat cell ids reused by many searches over the same
+    nodes, so no search allocates or clears buffers the size of the maze
+
+    A solver passed buffers takes its sets and maps from new_set() and
+    new_map(). Call reset() before each search: it empties every buffer in
+    constant time and hands them out again in the same order
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.sets = []
+        self.maps = []
+        self.used_sets = 0
+        self.used_maps = 0
+
+    def reset(self) -> None:
+        for b in self.sets + self.maps:
+            b.clear()
+        self.used_sets = 0
+        self.used_maps = 0
+
+    def new_set(self) -> StampedSet:
+        if self.used_sets == len(self.sets):
+            self.sets.append(StampedSet(self.size))
+        self.used_sets += 1
+        return self.sets[self.used_sets - 1]
+
+    def new_map(self) -> StampedMap:
+        if self.used_maps == len(self.maps):
+            self.maps.append(StampedMap(self.size))
+        self.used_maps += 1
+        return self.maps[self.used_maps - 1]
+
+
 def backtrack_solution(finish, parents, start):
     """
     Returns the path found to the finish cell. 
@@ -35,6 +218,27 @@ def backtrack_solution(finish, parents, start):
     return path
 
 
+def bernoulli_indices(n: int, p: float, rng: random.Random = random):
+    """
+    Yields the indices in range(n) that are each chosen independently with
+    probability p. The gaps between chosen indices are drawn from a
+    geometric distribution, so only one random number is drawn per chosen
+    index instead of one per index
+    """
+    if p <= 0:
+        return
+    if p >= 1:
+        yield from range(n)
+        return
+    log_q = math.log1p(-p)
+    i = -1
+    while True:
+        i += 1 + int(math.log(1.0 - rng.random()) / log_q)
+        if i >= n:
+            return
+        yield i
+
+
 def heuristic(p1, p2, method) -> int:
     if method == 'euclidian':
         return math.sqrt((p1.row - p2.row)**2 + (p1.col - p2.col)**2)